@@ -28,9 +28,12 @@ def main():
     else:
         print("✅ Groq API key found")
     
-    # Check data
+    # Check data: the processor writes a meta.json + jsonl pair, but
+    # older runs produced a single JSON file; both layouts load fine
     data_path = Path("data/processed/ottawa_chunks.json")
-    if not data_path.exists():
+    meta_path = Path("data/processed/ottawa_chunks.meta.json")
+    jsonl_path = Path("data/processed/ottawa_chunks.jsonl")
+    if not data_path.exists() and not (meta_path.exists() and jsonl_path.exists()):
         print("❌ Processed data not found. Run: python simple_processor.py")
         return 1
     else:
@@ -20,43 +20,64 @@ class SimpleTextSplitter:
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
     
-    def split_text(self, text: str) -> List[str]:
-        """Split text into chunks with overlap"""
-        if len(text) <= self.chunk_size:
-            return [text]
-        
-        chunks = []
+    def split_text_offsets(self, text: str) -> List[Tuple[int, int]]:
+        """Split text into (start, end) offset pairs without materializing chunk strings
+
+        Callers that only need to serialize chunks can slice text[start:end]
+        on the fly, avoiding N small string allocations up front.
+        """
+        # Hoist loop invariants: len(text) was re-evaluated several times
+        # per iteration in the hottest loop of this module
+        n = len(text)
+        chunk_size = self.chunk_size
+        chunk_overlap = self.chunk_overlap
+        sentinel = n - chunk_overlap
+
+        if n <= chunk_size:
+            return [(0, n)]
+
+        offsets = []
         start = 0
-        
-        while start < len(text):
-            end = min(start + self.chunk_size, len(text))
-            
+
+        while start < n:
+            end = min(start + chunk_size, n)
+
             # Try to break at sentence boundary
-            if end < len(text):
+            if end < n:
                 # Look for sentence endings within the last 100 characters
                 search_start = max(end - 100, start)
                 sentence_endings = ['.', '!', '?', '\n']
-                
+
                 best_break = -1
                 for i in range(end - 1, search_start - 1, -1):
-                    if text[i] in sentence_endings and i + 1 < len(text):
-                        if text[i + 1] in [' ', '\n', '\t'] or i + 1 == len(text):
+                    if text[i] in sentence_endings and i + 1 < n:
+                        if text[i + 1] in [' ', '\n', '\t'] or i + 1 == n:
                             best_break = i + 1
                             break
-                
+
                 if best_break > 0:
                     end = best_break
-            
-            chunk = text[start:end].strip()
-            if chunk:
-                chunks.append(chunk)
-            
+
+            # Trim whitespace by moving the offsets, not by allocating a string
+            chunk_start, chunk_end = start, end
+            while chunk_start < chunk_end and text[chunk_start].isspace():
+                chunk_start += 1
+            while chunk_end > chunk_start and text[chunk_end - 1].isspace():
+                chunk_end -= 1
+
+            if chunk_end > chunk_start:
+                offsets.append((chunk_start, chunk_end))
+
             # Move start position with overlap
-            start = end - self.chunk_overlap
-            if start >= len(text) - self.chunk_overlap:
+            start = end - chunk_overlap
+            if start >= sentinel:
                 break
-        
-        return chunks
+
+        return offsets
+
+    def split_text(self, text: str) -> List[str]:
+        """Split text into chunks with overlap"""
+        return [text[s:e] for s, e in self.split_text_offsets(text)]
 
 class SimpleOttawaDataProcessor:
     """Simplified data processor without external dependencies"""
@@ -214,11 +235,14 @@ class SimpleOttawaDataProcessor:
                     self.logger.warning(f"Document too short, skipping: {document.get('url', 'unknown')}")
                     continue
                 
-                text_chunks = self.text_splitter.split_text(cleaned_content)
-                
-                for chunk_idx, chunk_text in enumerate(text_chunks):
-                    if len(chunk_text) >= self.min_chunk_length:
-                        
+                # Work from offset pairs and slice lazily, so chunk strings
+                # are only materialized once, when the record is built
+                chunk_offsets = self.text_splitter.split_text_offsets(cleaned_content)
+
+                for chunk_idx, (chunk_start, chunk_end) in enumerate(chunk_offsets):
+                    if chunk_end - chunk_start >= self.min_chunk_length:
+                        chunk_text = cleaned_content[chunk_start:chunk_end]
+
                         chunk = {
                             "id": f"chunk_{chunk_id_counter:06d}",
                             "document_id": f"doc_{doc_idx:06d}",
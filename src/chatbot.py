@@ -6,17 +6,214 @@ Complete Gradio interface integrating all RAG pipeline components
 import os
 import gradio as gr
 import logging
+import re
+import sqlite3
+import threading
+import time
+import numpy as np
+from collections import deque
+from functools import lru_cache
 from typing import Dict, Any, List, Tuple, Optional
 from datetime import datetime
 import json
 from pathlib import Path
 
-# Import your RAG pipeline components - absolute imports
+# Import your RAG pipeline components - absolute imports; the pipeline
+# encapsulates the embedding, vector store, and LLM components, so only
+# it is imported here
 from rag_pipeline import OttawaRAGPipeline
-from data_processor import DataProcessor
-from embeddings import EmbeddingManager
-from vector_store import VectorStore
-from llm_interface import LLMInterface
+
+# Optional orjson for (de)serializing persisted cache entries; the stdlib
+# json module is the fallback
+try:
+    import orjson
+
+    def _json_dumps(obj: Any) -> str:
+        # OPT_SERIALIZE_NUMPY: pipeline responses carry numpy scalars
+        # (e.g. confidence), which orjson otherwise rejects
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+
+    _json_loads = orjson.loads
+
+except ImportError:
+
+    def _json_dumps(obj: Any) -> str:
+        return json.dumps(obj)
+
+    _json_loads = json.loads
+
+
+# Optional fuzzy matcher for near-identical question text; exact-match
+# lookups still work without it
+try:
+    from rapidfuzz import fuzz as _fuzz
+    from rapidfuzz import process as _fuzz_process
+except ImportError:
+    _fuzz = None
+    _fuzz_process = None
+
+_RE_PUNCT = re.compile(r"[^\w\s]")
+_RE_WS = re.compile(r"\s+")
+
+
+def _normalize_question(question: str) -> str:
+    """Lowercase, strip punctuation, and collapse whitespace in a question"""
+    return _RE_WS.sub(" ", _RE_PUNCT.sub("", question.lower())).strip()
+
+
+# Optional numba-compiled cache scan; falls back to the NumPy matmul when
+# numba is not installed
+try:
+    from numba import njit, prange
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _cache_scan(matrix, query):
+        """Dot every int8 cache row with the int8 query, int32 accumulation"""
+        n, d = matrix.shape
+        out = np.empty(n, dtype=np.int32)
+        for i in prange(n):
+            total = np.int32(0)
+            for j in range(d):
+                total += np.int32(matrix[i, j]) * np.int32(query[j])
+            out[i] = total
+        return out
+
+except ImportError:
+
+    def _cache_scan(matrix, query):
+        """Dot every int8 cache row with the int8 query, int32 accumulation"""
+        return matrix.astype(np.int32) @ query.astype(np.int32)
+
+
+# Static interface assets, built once at import instead of per instance
+_OTTAWA_CSS = """
+.ottawa-header {
+    background: linear-gradient(90deg, #d41e2c 0%, #1f4788 100%);
+    color: white;
+    padding: 20px;
+    border-radius: 10px;
+    margin-bottom: 20px;
+    text-align: center;
+}
+
+.ottawa-title {
+    font-size: 24px;
+    font-weight: bold;
+    margin-bottom: 5px;
+}
+
+.ottawa-subtitle {
+    font-size: 14px;
+    opacity: 0.9;
+}
+
+.example-questions {
+    background: #f8f9fa;
+    border: 1px solid #e9ecef;
+    border-radius: 8px;
+    padding: 15px;
+    margin: 10px 0;
+}
+
+.source-citation {
+    background: #e8f4fd;
+    border-left: 4px solid #1f4788;
+    padding: 10px;
+    margin: 5px 0;
+    border-radius: 4px;
+    font-size: 12px;
+}
+
+.confidence-high { color: #28a745; font-weight: bold; }
+.confidence-medium { color: #ffc107; font-weight: bold; }
+.confidence-low { color: #dc3545; font-weight: bold; }
+
+.stats-box {
+    background: #f8f9fa;
+    border: 1px solid #dee2e6;
+    border-radius: 6px;
+    padding: 10px;
+    margin: 5px;
+    text-align: center;
+}
+"""
+
+_OTTAWA_HEADER_HTML = """
+    <div class="ottawa-header">
+        <div class="ottawa-title">🏛️ Ottawa City Services Assistant</div>
+        <div class="ottawa-subtitle">
+            Intelligent assistant powered by AI • Ask questions about Ottawa city services
+        </div>
+    </div>
+"""
+
+_EXAMPLES_HTML = """
+    <div class="example-questions">
+        <strong>💡 Try asking about:</strong><br>
+        • "How do I apply for a marriage license?"<br>
+        • "What are the rules for backyard fires?"<br>
+        • "What can I put in my green bin?"<br>
+        • "How do I get a business license?"<br>
+        • "What are the parking regulations downtown?"
+    </div>
+"""
+
+
+# Confidence tier thresholds, highest first; the first entry whose
+# threshold the score meets wins
+_CONFIDENCE_TIERS = (
+    (0.8, "confidence-high", "🟢"),
+    (0.5, "confidence-medium", "🟡"),
+    (0.0, "confidence-low", "🔴"),
+)
+
+
+@lru_cache(maxsize=512)
+def _format_confidence_cached(confidence: float) -> str:
+    """Render the confidence display HTML, memoized on the rounded score"""
+    css_class, emoji = _CONFIDENCE_TIERS[-1][1:]
+    for threshold, tier_class, tier_emoji in _CONFIDENCE_TIERS:
+        if confidence >= threshold:
+            css_class, emoji = tier_class, tier_emoji
+            break
+
+    return f"""
+    <div style="text-align: center; padding: 10px;">
+        <div style="font-size: 18px;">{emoji}</div>
+        <div class="{css_class}">Confidence: {confidence:.1%}</div>
+    </div>
+    """
+
+
+@lru_cache(maxsize=512)
+def _format_sources_cached(source_key: Tuple[Tuple[str, float], ...]) -> str:
+    """Render the sources citation HTML, memoized on (url, similarity) pairs"""
+    if not source_key:
+        return "<div>No sources available</div>"
+
+    # Accumulate fragments and join once instead of growing a string
+    parts = ["<div><strong>📚 Sources:</strong></div>"]
+
+    for i, (url, similarity) in enumerate(source_key):
+        if url:
+            # Clean URL for display
+            display_url = url.replace("https://ottawa.ca/", "").replace(
+                "https://", ""
+            )
+            if len(display_url) > 50:
+                display_url = display_url[:47] + "..."
+
+            parts.append(
+                f"""
+            <div class="source-citation">
+                <strong>Source {i+1}:</strong>
+                <a href="{url}" target="_blank">{display_url}</a>
+                <br><small>Relevance: {similarity:.1%}</small>
+            </div>
+            """
+            )
+
+    return "".join(parts)
 
 
 class OttawaChatbot:
@@ -56,16 +253,58 @@ class OttawaChatbot:
         self.pipeline = None
         self.pipeline_initialized = False
 
-        # Session tracking
-        self.session_history = []
+        # Snapshot of mostly-static pipeline stats, refreshed on demand so
+        # the per-question status render avoids a get_system_stats() call
+        self._stats_snapshot = {}
+
+        # Session tracking (deque evicts the oldest entry in O(1))
+        self.session_history = deque(maxlen=100)
         self.total_questions = 0
         self.successful_responses = 0
 
+        # Running confidence aggregates so usage stats stay O(1)
+        self._conf_sum = 0.0
+        self._conf_count = 0
+
+        # Semantic cache for repeated/near-duplicate questions
+        # Entries are (int8-quantized embedding, response_data) in LRU
+        # order; unit-norm float32 vectors are scaled by 127 and packed
+        # to int8, cutting per-entry memory 4x
+        self._sem_cache = []
+        self._sem_cache_capacity = 128
+        self._sem_cache_threshold = 0.86
+
+        # Exact-match cache keyed on normalized question text; hits here
+        # skip the embedding forward pass entirely
+        self._exact_cache = {}
+        self._exact_cache_capacity = 256
+
+        # On-disk copy of the semantic cache so restarts keep it warm
+        self._sem_cache_db_path = Path("data/semantic_cache.db")
+        self._sem_cache_db_lock = threading.Lock()
+
+        # Memoized question embeddings keyed on normalized question text,
+        # so repeat questions skip the SentenceTransformer forward pass
+        self._embed_cached = lru_cache(maxsize=1024)(self._embed_question)
+
+        # Canned questions behind the example buttons, pre-warmed at startup
+        self._example_questions = [
+            "How do I apply for a marriage license?",
+            "What are the parking regulations in downtown Ottawa?",
+            "What can I put in my green bin for waste collection?",
+            "What are the rules for backyard fires?",
+        ]
+        self._warm_embeddings = {}
+
         # Setup logging
         self._setup_logging()
 
-        # Initialize pipeline
-        self._initialize_pipeline(groq_api_key)
+        # Initialize pipeline in a background thread so the Gradio server
+        # binds immediately instead of blocking on dataset + vector DB load
+        self._init_event = threading.Event()
+        threading.Thread(
+            target=self._initialize_pipeline, args=(groq_api_key,), daemon=True
+        ).start()
 
         # Create Gradio interface
         self.interface = self._create_interface()
@@ -95,6 +334,9 @@ class OttawaChatbot:
                 # Initialize vector database
                 if self.pipeline.initialize_vector_database():
                     self.pipeline_initialized = True
+                    self._refresh_stats_snapshot()
+                    self._load_semantic_cache()
+                    self._warm_example_questions()
                     self.logger.info("RAG Pipeline initialized successfully")
                 else:
                     self.logger.error("Failed to initialize vector database")
@@ -105,77 +347,242 @@ class OttawaChatbot:
             self.logger.error(f"Error initializing pipeline: {e}")
             self.pipeline_initialized = False
 
-    def _create_interface(self) -> gr.Blocks:
-        """Create the complete Gradio interface"""
+        finally:
+            self._init_event.set()
+
+    def _refresh_stats_snapshot(self):
+        """Re-read system stats from the pipeline into the cached snapshot"""
+        if self.pipeline:
+            try:
+                self._stats_snapshot = dict(self.pipeline.get_system_stats())
+            except Exception as e:
+                self.logger.warning(f"Error refreshing stats snapshot: {e}")
 
-        # Custom CSS for Ottawa branding
-        custom_css = """
-        .ottawa-header {
-            background: linear-gradient(90deg, #d41e2c 0%, #1f4788 100%);
-            color: white;
-            padding: 20px;
-            border-radius: 10px;
-            margin-bottom: 20px;
-            text-align: center;
-        }
-        
-        .ottawa-title {
-            font-size: 24px;
-            font-weight: bold;
-            margin-bottom: 5px;
-        }
-        
-        .ottawa-subtitle {
-            font-size: 14px;
-            opacity: 0.9;
-        }
-        
-        .example-questions {
-            background: #f8f9fa;
-            border: 1px solid #e9ecef;
-            border-radius: 8px;
-            padding: 15px;
-            margin: 10px 0;
-        }
-        
-        .source-citation {
-            background: #e8f4fd;
-            border-left: 4px solid #1f4788;
-            padding: 10px;
-            margin: 5px 0;
-            border-radius: 4px;
-            font-size: 12px;
-        }
-        
-        .confidence-high { color: #28a745; font-weight: bold; }
-        .confidence-medium { color: #ffc107; font-weight: bold; }
-        .confidence-low { color: #dc3545; font-weight: bold; }
-        
-        .stats-box {
-            background: #f8f9fa;
-            border: 1px solid #dee2e6;
-            border-radius: 6px;
-            padding: 10px;
-            margin: 5px;
-            text-align: center;
-        }
+    def _embed_question(self, text: str) -> np.ndarray:
+        """Embed a single question and L2-normalize the vector
+
+        Wrapped with functools.lru_cache in __init__; call through
+        self._embed_cached with normalized text so repeat questions hit
+        the memo instead of the embedding model.
         """
+        warm = self._warm_embeddings.get(text)
+        if warm is not None:
+            return warm
+
+        embedding = self.pipeline.embedding_manager.generate_embeddings(
+            [text], use_cache=False, show_progress=False
+        )[0].astype(np.float32)
+
+        norm = np.linalg.norm(embedding)
+        return embedding / norm if norm else embedding
+
+    def _warm_example_questions(self):
+        """Batch-embed the example questions and pre-warm retrieval
+
+        One batched forward pass replaces four sequential ones, and the
+        warm-up searches prime the vector store before the first click.
+        """
+        try:
+            keys = [q.strip().lower() for q in self._example_questions]
+            embeddings = self.pipeline.embedding_manager.generate_embeddings(
+                keys, use_cache=False, show_progress=False
+            ).astype(np.float32)
+
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            embeddings = embeddings / norms
+
+            for key, embedding in zip(keys, embeddings):
+                self._warm_embeddings[key] = embedding
+                self.pipeline.search_relevant_context(
+                    key, top_k=5, precomputed_embedding=embedding
+                )
+
+            self.logger.info(
+                f"Pre-warmed {len(keys)} example questions"
+            )
+
+        except Exception as e:
+            self.logger.warning(f"Error pre-warming example questions: {e}")
+
+    def _exact_cache_lookup(
+        self, question: str
+    ) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """
+        Look up a cached response by normalized question text
+
+        Punctuation/casing edits ("How do I...?" vs "how do i...") map to
+        the same key, and, when rapidfuzz is available, short typo edits
+        are absorbed by a fuzzy match over the cached keys.
+
+        Args:
+            question: Raw user question
+
+        Returns:
+            Tuple of (normalized question, cached response or None)
+        """
+        normalized = _normalize_question(question)
+
+        cached = self._exact_cache.get(normalized)
+        if cached is not None:
+            self.logger.info("Exact cache hit")
+            return normalized, cached
+
+        if _fuzz_process is not None and self._exact_cache:
+            match = _fuzz_process.extractOne(
+                normalized,
+                self._exact_cache.keys(),
+                scorer=_fuzz.ratio,
+                score_cutoff=95,
+            )
+            if match is not None:
+                self.logger.info(f"Fuzzy cache hit (score: {match[1]:.1f})")
+                return normalized, self._exact_cache[match[0]]
+
+        return normalized, None
+
+    def _exact_cache_store(self, normalized: str, response_data: Dict[str, Any]):
+        """Store a successful response keyed on normalized question text"""
+        if not normalized or not response_data.get("answer"):
+            return
+
+        if len(self._exact_cache) >= self._exact_cache_capacity:
+            # Evict the oldest insertion (dicts preserve insertion order)
+            self._exact_cache.pop(next(iter(self._exact_cache)))
+
+        self._exact_cache[normalized] = response_data
+
+    @staticmethod
+    def _quantize_embedding(embedding: np.ndarray) -> np.ndarray:
+        """Quantize a unit-norm float32 embedding to int8
+
+        Components of a normalized vector have magnitude <= 1, so scaling
+        by 127 keeps the full int8 range without clipping in practice.
+        """
+        return np.round(embedding * 127.0).clip(-127, 127).astype(np.int8)
+
+    def _semantic_cache_lookup(
+        self, question: str
+    ) -> Tuple[Optional[np.ndarray], Optional[Dict[str, Any]]]:
+        """
+        Look up a cached response for a semantically similar past question
+
+        Args:
+            question: User question to match against cached questions
+
+        Returns:
+            Tuple of (normalized question embedding, cached response or None)
+        """
+        try:
+            embedding = self._embed_cached(question.strip().lower())
+
+            if not self._sem_cache:
+                return embedding, None
+
+            # Single (N, 384) @ (384,) dot product over int8 rows with
+            # int32 accumulation; dividing by 127^2 recovers the cosine
+            # similarity of the original unit-norm vectors
+            query_int8 = self._quantize_embedding(embedding)
+            cached_matrix = np.stack([entry[0] for entry in self._sem_cache])
+            similarities = _cache_scan(cached_matrix, query_int8) / (127.0 * 127.0)
+
+            best_idx = int(np.argmax(similarities))
+            if similarities[best_idx] >= self._sem_cache_threshold:
+                # Refresh the LRU position of the hit
+                self._sem_cache.append(self._sem_cache.pop(best_idx))
+                self.logger.info(
+                    f"Semantic cache hit (similarity: {similarities[best_idx]:.3f})"
+                )
+                return embedding, self._sem_cache[-1][1]
+
+            return embedding, None
+
+        except Exception as e:
+            self.logger.warning(f"Semantic cache lookup failed: {e}")
+            return None, None
+
+    def _sem_cache_connect(self) -> sqlite3.Connection:
+        """Open the on-disk semantic cache, creating the table if needed"""
+        self._sem_cache_db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self._sem_cache_db_path))
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS sem_cache (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                embedding BLOB NOT NULL,
+                response TEXT NOT NULL,
+                created REAL NOT NULL
+            )
+            """
+        )
+        return conn
+
+    def _load_semantic_cache(self):
+        """Load persisted semantic cache entries for cold-start reuse"""
+        try:
+            with self._sem_cache_db_lock, self._sem_cache_connect() as conn:
+                rows = conn.execute(
+                    "SELECT embedding, response FROM sem_cache "
+                    "ORDER BY created DESC LIMIT ?",
+                    (self._sem_cache_capacity,),
+                ).fetchall()
+
+            # Oldest first so recent entries end up at the hot end of the LRU
+            for embedding_blob, response_json in reversed(rows):
+                embedding = np.frombuffer(embedding_blob, dtype=np.int8)
+                self._sem_cache.append((embedding, _json_loads(response_json)))
+
+            if rows:
+                self.logger.info(
+                    f"Loaded {len(rows)} semantic cache entries from disk"
+                )
+
+        except Exception as e:
+            self.logger.warning(f"Error loading semantic cache: {e}")
+
+    def _semantic_cache_store(
+        self, embedding: Optional[np.ndarray], response_data: Dict[str, Any]
+    ):
+        """Store a successful response in the semantic cache with LRU eviction"""
+        if embedding is None or not response_data.get("answer"):
+            return
+
+        if len(self._sem_cache) >= self._sem_cache_capacity:
+            self._sem_cache.pop(0)  # Evict least recently used entry
+
+        quantized = self._quantize_embedding(embedding.astype(np.float32))
+        self._sem_cache.append((quantized, response_data))
+
+        # Mirror the entry to disk so the cache survives restarts
+        try:
+            with self._sem_cache_db_lock, self._sem_cache_connect() as conn:
+                conn.execute(
+                    "INSERT INTO sem_cache (embedding, response, created) "
+                    "VALUES (?, ?, ?)",
+                    (
+                        quantized.tobytes(),
+                        _json_dumps(response_data),
+                        time.time(),
+                    ),
+                )
+                conn.execute(
+                    "DELETE FROM sem_cache WHERE id NOT IN "
+                    "(SELECT id FROM sem_cache ORDER BY created DESC LIMIT ?)",
+                    (self._sem_cache_capacity,),
+                )
+
+        except Exception as e:
+            self.logger.warning(f"Error persisting semantic cache entry: {e}")
+
+    def _create_interface(self) -> gr.Blocks:
+        """Create the complete Gradio interface"""
 
         with gr.Blocks(
-            css=custom_css, title="Ottawa City Services Assistant"
+            css=_OTTAWA_CSS, title="Ottawa City Services Assistant"
         ) as interface:
             # Header
             with gr.Row():
-                gr.HTML(
-                    """
-                    <div class="ottawa-header">
-                        <div class="ottawa-title">🏛️ Ottawa City Services Assistant</div>
-                        <div class="ottawa-subtitle">
-                            Intelligent assistant powered by AI • Ask questions about Ottawa city services
-                        </div>
-                    </div>
-                """
-                )
+                gr.HTML(_OTTAWA_HEADER_HTML)
 
             # Main chat interface
             with gr.Tab("💬 Ask Questions"):
@@ -200,18 +607,7 @@ class OttawaChatbot:
                             submit_btn = gr.Button("Ask", variant="primary", scale=0)
 
                         # Example questions
-                        gr.HTML(
-                            """
-                            <div class="example-questions">
-                                <strong>💡 Try asking about:</strong><br>
-                                • "How do I apply for a marriage license?"<br>
-                                • "What are the rules for backyard fires?"<br>
-                                • "What can I put in my green bin?"<br>
-                                • "How do I get a business license?"<br>
-                                • "What are the parking regulations downtown?"
-                            </div>
-                        """
-                        )
+                        gr.HTML(_EXAMPLES_HTML)
 
                         # Quick action buttons
                         with gr.Row():
@@ -312,26 +708,91 @@ class OttawaChatbot:
                 )
 
             # Event handlers
-            def process_question(
-                question: str, history: List
-            ) -> Tuple[List, str, str, str]:
-                """Process user question and return response with metadata"""
+            def process_question(question: str, history: List):
+                """Process user question, streaming partial answers to the chat
+
+                Implemented as a generator so Gradio renders tokens as the
+                LLM produces them instead of blocking on the full response.
+                """
                 try:
                     if not question.strip():
-                        return history, "", "", self._get_status_html()
+                        yield history, "", "", self._get_status_html(), ""
+                        return
+
+                    if not self._init_event.is_set():
+                        warming_msg = (
+                            "⏳ The system is still loading, please try again "
+                            "in a moment."
+                        )
+                        history.append([question, warming_msg])
+                        yield history, "", "", self._get_status_html(), ""
+                        return
 
                     if not self.pipeline_initialized:
                         error_msg = (
                             "⚠️ System not ready. Please check the system status."
                         )
                         history.append([question, error_msg])
-                        return history, "", "", self._get_status_html()
+                        yield history, "", "", self._get_status_html(), ""
+                        return
 
                     # Track question
                     self.total_questions += 1
 
-                    # Get response from RAG pipeline
-                    response_data = self.pipeline.answer_question(question)
+                    # Check the exact-match cache first (no embedding work),
+                    # then the semantic cache, before running the pipeline
+                    normalized, cached_response = self._exact_cache_lookup(
+                        question
+                    )
+                    query_embedding = None
+
+                    if cached_response is None:
+                        query_embedding, cached_response = (
+                            self._semantic_cache_lookup(question)
+                        )
+
+                    if cached_response is not None:
+                        response_data = cached_response
+                    else:
+                        # Stream response from the RAG pipeline: the first
+                        # item is a metadata dict, the rest are text deltas
+                        response_data = {}
+                        partial_answer = ""
+                        history.append([question, ""])
+
+                        for item in self.pipeline.answer_question_stream(
+                            question, precomputed_embedding=query_embedding
+                        ):
+                            if isinstance(item, dict):
+                                response_data = item
+                                continue
+
+                            partial_answer += item
+                            history[-1][1] = partial_answer
+                            # Only the chat changes per token; gr.update()
+                            # no-ops keep the other components out of the
+                            # per-token HTTP payload
+                            yield (
+                                history,
+                                gr.update(),
+                                gr.update(),
+                                gr.update(),
+                                gr.update(),
+                            )
+
+                        history.pop()
+                        response_data["answer"] = partial_answer
+                        # Only cache real answers: zero-confidence
+                        # (no-context) and error responses would
+                        # otherwise replay for every similar question
+                        if (
+                            response_data.get("confidence", 0) > 0
+                            and "error" not in response_data
+                        ):
+                            self._semantic_cache_store(
+                                query_embedding, response_data
+                            )
+                            self._exact_cache_store(normalized, response_data)
 
                     if response_data.get("answer"):
                         self.successful_responses += 1
@@ -351,33 +812,35 @@ class OttawaChatbot:
                         confidence_html = self._format_confidence(confidence)
                         sources_html = self._format_sources(sources)
 
-                        return (
+                        yield (
                             history,
                             confidence_html,
                             sources_html,
                             self._get_status_html(),
+                            "",
                         )
 
                     else:
                         error_response = "I'm sorry, I couldn't find relevant information about that topic. Please try rephrasing your question or ask about other Ottawa city services."
                         history.append([question, error_response])
-                        return history, "", "", self._get_status_html()
+                        yield history, "", "", self._get_status_html(), ""
 
                 except Exception as e:
                     self.logger.error(f"Error processing question: {e}")
                     error_response = "I encountered an error processing your question. Please try again."
                     history.append([question, error_response])
-                    return history, "", "", self._get_status_html()
+                    yield history, "", "", self._get_status_html(), ""
 
             def clear_chat():
                 """Clear the chat history"""
-                return [], "", "", self._get_status_html()
+                return [], "", "", self._get_status_html(), ""
 
             def set_example_question(example_text: str):
                 """Set example question in input field"""
                 return example_text
 
-            # Connect event handlers
+            # Connect event handlers; the textbox clear rides along in the
+            # main output tuple so each turn is a single Gradio event
             submit_btn.click(
                 process_question,
                 inputs=[question_input, chatbot_display],
@@ -386,8 +849,9 @@ class OttawaChatbot:
                     confidence_display,
                     sources_display,
                     status_display,
+                    question_input,
                 ],
-            ).then(lambda: "", outputs=[question_input])
+            )
 
             question_input.submit(
                 process_question,
@@ -397,8 +861,9 @@ class OttawaChatbot:
                     confidence_display,
                     sources_display,
                     status_display,
+                    question_input,
                 ],
-            ).then(lambda: "", outputs=[question_input])
+            )
 
             clear_btn.click(
                 clear_chat,
@@ -407,6 +872,7 @@ class OttawaChatbot:
                     confidence_display,
                     sources_display,
                     status_display,
+                    question_input,
                 ],
             )
 
@@ -443,51 +909,15 @@ class OttawaChatbot:
 
     def _format_confidence(self, confidence: float) -> str:
         """Format confidence score with colored display"""
-        if confidence >= 0.8:
-            css_class = "confidence-high"
-            emoji = "🟢"
-        elif confidence >= 0.5:
-            css_class = "confidence-medium"
-            emoji = "🟡"
-        else:
-            css_class = "confidence-low"
-            emoji = "🔴"
-
-        return f"""
-        <div style="text-align: center; padding: 10px;">
-            <div style="font-size: 18px;">{emoji}</div>
-            <div class="{css_class}">Confidence: {confidence:.1%}</div>
-        </div>
-        """
+        return _format_confidence_cached(round(confidence, 3))
 
     def _format_sources(self, sources: List[Dict]) -> str:
         """Format sources with citations"""
-        if not sources:
-            return "<div>No sources available</div>"
-
-        sources_html = "<div><strong>📚 Sources:</strong></div>"
-
-        for i, source in enumerate(sources[:3]):  # Show top 3 sources
-            url = source.get("url", "")
-            similarity = source.get("similarity", 0.0)
-
-            if url:
-                # Clean URL for display
-                display_url = url.replace("https://ottawa.ca/", "").replace(
-                    "https://", ""
-                )
-                if len(display_url) > 50:
-                    display_url = display_url[:47] + "..."
-
-                sources_html += f"""
-                <div class="source-citation">
-                    <strong>Source {i+1}:</strong> 
-                    <a href="{url}" target="_blank">{display_url}</a>
-                    <br><small>Relevance: {similarity:.1%}</small>
-                </div>
-                """
-
-        return sources_html
+        source_key = tuple(
+            (source.get("url", ""), round(source.get("similarity", 0.0), 3))
+            for source in sources[:3]  # Show top 3 sources
+        )
+        return _format_sources_cached(source_key)
 
     def _get_status_html(self) -> str:
         """Get current system status HTML"""
@@ -499,7 +929,7 @@ class OttawaChatbot:
             </div>
             """
 
-        stats = self.pipeline.get_system_stats() if self.pipeline else {}
+        stats = self._stats_snapshot
 
         return f"""
         <div style="color: green;">
@@ -513,8 +943,10 @@ class OttawaChatbot:
     def _track_session(self, question: str, response_data: Dict[str, Any]):
         """Track session data for analytics"""
         if self.enable_analytics:
+            # Store a raw float timestamp; formatting happens lazily in
+            # _get_recent_questions, the only consumer
             session_entry = {
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": time.time(),
                 "question": question,
                 "confidence": response_data.get("confidence", 0.0),
                 "sources_count": len(response_data.get("sources", [])),
@@ -522,11 +954,19 @@ class OttawaChatbot:
                 "success": bool(response_data.get("answer")),
             }
 
+            # Account for the entry the bounded deque is about to evict
+            if len(self.session_history) == self.session_history.maxlen:
+                evicted = self.session_history[0]
+                if evicted["success"]:
+                    self._conf_sum -= evicted["confidence"]
+                    self._conf_count -= 1
+
             self.session_history.append(session_entry)
 
-            # Keep only last 100 entries
-            if len(self.session_history) > 100:
-                self.session_history = self.session_history[-100:]
+            # Maintain the running confidence aggregates
+            if session_entry["success"]:
+                self._conf_sum += session_entry["confidence"]
+                self._conf_count += 1
 
     def _get_usage_stats(self) -> str:
         """Get usage statistics HTML"""
@@ -534,15 +974,7 @@ class OttawaChatbot:
             return "<div>Analytics disabled</div>"
 
         success_rate = (self.successful_responses / max(self.total_questions, 1)) * 100
-        avg_confidence = 0
-
-        if self.session_history:
-            confidences = [
-                entry["confidence"]
-                for entry in self.session_history
-                if entry["success"]
-            ]
-            avg_confidence = sum(confidences) / len(confidences) if confidences else 0
+        avg_confidence = self._conf_sum / max(self._conf_count, 1)
 
         return f"""
         <div class="stats-box">
@@ -559,7 +991,9 @@ class OttawaChatbot:
         if not self.pipeline:
             return "<div style='color: red;'>❌ Pipeline not initialized</div>"
 
-        stats = self.pipeline.get_system_stats()
+        # Explicit refresh: this handler is the admin panel's refresh button
+        self._refresh_stats_snapshot()
+        stats = self._stats_snapshot
 
         return f"""
         <div class="stats-box">
@@ -577,10 +1011,12 @@ class OttawaChatbot:
         if not self.enable_analytics or not self.session_history:
             return []
 
-        recent = self.session_history[-10:]  # Last 10 questions
+        recent = list(self.session_history)[-10:]  # Last 10 questions
         return [
             [
-                entry["timestamp"][:19].replace("T", " "),  # Format timestamp
+                time.strftime(
+                    "%Y-%m-%d %H:%M:%S", time.localtime(entry["timestamp"])
+                ),
                 entry["question"][:50] + ("..." if len(entry["question"]) > 50 else ""),
                 "✅ Success" if entry["success"] else "❌ Failed",
                 f"{entry['confidence']:.1%}",
@@ -597,7 +1033,9 @@ class OttawaChatbot:
     ):
         """Launch the Gradio interface"""
 
-        if not self.pipeline_initialized:
+        if not self._init_event.is_set():
+            self.logger.info("Pipeline still initializing in the background")
+        elif not self.pipeline_initialized:
             self.logger.warning("Pipeline not initialized - running in demo mode")
 
         self.logger.info(f"Launching Ottawa Chatbot on {server_name}:{server_port}")
@@ -4,17 +4,54 @@ Fixed version that handles Groq client compatibility issues
 """
 
 import os
-from typing import Dict, Any, Optional, List
+import asyncio
+import hashlib
+import re
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Iterator, Optional, List
 import logging
 import time
 from datetime import datetime
 
+# Optional httpx for connection pooling on the async client
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+# Parses "A[1]: ..." style answers out of a batched completion
+_BATCH_ANSWER_RE = re.compile(r"A\[(\d+)\]:\s*(.*?)(?=\nA\[\d+\]:|\Z)", re.DOTALL)
+
 
 class LLMInterface:
     """
     Simple LLM interface that handles Groq API compatibility issues
     """
 
+    # Prefix-stability contract: every request sends this exact system
+    # message as messages[0], byte-identical across calls, so providers
+    # that cache prompt prefixes can reuse the prefill. All steering rules
+    # live here; user messages carry only the volatile context + question.
+    _SYSTEM_PREFIX = (
+        "You are a helpful assistant for Ottawa city services. Provide "
+        "accurate, helpful information based on official sources.\n"
+        "\n"
+        "INSTRUCTIONS:\n"
+        "1. Provide a clear, accurate answer based on the context in the "
+        "user message\n"
+        "2. If the context contains specific procedures, list them step by step\n"
+        "3. Include relevant fees, locations, or contact information when "
+        "available\n"
+        "4. If the context doesn't fully answer the question, say so clearly\n"
+        "5. Always prioritize official Ottawa information over general knowledge\n"
+        "6. Be helpful and conversational while remaining factual\n"
+        "7. If mentioning fees or procedures, note that information should be "
+        "verified on ottawa.ca as it may change"
+    )
+
     def __init__(
         self,
         api_key: Optional[str] = None,
@@ -38,6 +75,16 @@ class LLMInterface:
         self.total_requests = 0
         self.total_tokens_used = 0
         self.avg_response_time = 0.0
+        self._rt_sum = 0.0
+
+        # Exact-match response cache: identical (model, sampling params,
+        # prompt) tuples skip the network round-trip entirely. Only used
+        # at low temperature, where responses are near-deterministic.
+        self._response_cache = OrderedDict()
+        self._response_cache_maxsize = 1000
+        self._response_cache_ttl = 3600  # seconds
+        self._response_cache_db_path = Path("data/llm_cache.db")
+        self._response_cache_db_lock = threading.Lock()
 
     def _setup_logging(self):
         """Setup logging for LLM operations"""
@@ -49,25 +96,146 @@ class LLMInterface:
             if not self.api_key:
                 self.logger.warning("No Groq API key provided - running in demo mode")
                 self.client = None
+                self.aclient = None
                 return
 
             # Try to import and initialize Groq client
             try:
                 from groq import Groq
 
-                self.client = Groq(api_key=self.api_key)
+                # Keep-alive connection pool: after the warmup below,
+                # real queries reuse an open TLS connection instead of
+                # paying DNS+TCP+TLS setup
+                sync_kwargs = {"api_key": self.api_key}
+                if httpx is not None:
+                    sync_kwargs["http_client"] = httpx.Client(
+                        limits=httpx.Limits(
+                            max_connections=32, max_keepalive_connections=16
+                        ),
+                        timeout=self.timeout,
+                    )
+
+                self.client = Groq(**sync_kwargs)
                 self.logger.info(
                     f"Groq client initialized with model: {self.model_name}"
                 )
 
+                threading.Thread(target=self._warmup_client, daemon=True).start()
+
             except Exception as e:
                 self.logger.error(f"Error initializing Groq client: {e}")
                 self.logger.warning("Running in demo mode without LLM")
                 self.client = None
 
+            # Async client shared across requests: keep-alive pooling
+            # skips TCP+TLS handshakes, and gather-based dispatch runs
+            # batches concurrently
+            try:
+                from groq import AsyncGroq
+
+                client_kwargs = {"api_key": self.api_key}
+                if httpx is not None:
+                    client_kwargs["http_client"] = httpx.AsyncClient(
+                        limits=httpx.Limits(
+                            max_connections=32, max_keepalive_connections=16
+                        ),
+                        timeout=self.timeout,
+                    )
+
+                self.aclient = AsyncGroq(**client_kwargs)
+
+            except Exception as e:
+                self.logger.warning(f"Async Groq client unavailable: {e}")
+                self.aclient = None
+
         except ImportError:
             self.logger.error("Groq package not available")
             self.client = None
+            self.aclient = None
+
+    def _warmup_client(self):
+        """Fire a tiny completion to open the connection ahead of real use"""
+        try:
+            self.client.chat.completions.create(
+                model=self.model_name,
+                messages=[{"role": "user", "content": "hi"}],
+                max_tokens=1,
+            )
+        except Exception:
+            # Warmup is best-effort; real calls handle their own errors
+            pass
+
+    def _response_cache_key(self, prompt: str) -> str:
+        """Cache key covering the model, sampling params, and full prompt"""
+        key_material = (
+            f"{self.model_name}|{self.temperature}|{self.max_tokens}|{prompt}"
+        )
+        return hashlib.sha256(key_material.encode("utf-8")).hexdigest()
+
+    def _response_cache_connect(self) -> sqlite3.Connection:
+        """Open the on-disk response cache, creating the table if needed"""
+        self._response_cache_db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self._response_cache_db_path))
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                created REAL NOT NULL
+            )
+            """
+        )
+        return conn
+
+    def _response_cache_lookup(self, key: str) -> Optional[str]:
+        """Return a cached response for the key, or None"""
+        cached = self._response_cache.get(key)
+        if cached is not None:
+            response, created = cached
+            if time.time() - created <= self._response_cache_ttl:
+                self._response_cache.move_to_end(key)
+                return response
+            # Expired: drop it and fall through to the sqlite mirror
+            del self._response_cache[key]
+
+        try:
+            with self._response_cache_db_lock, self._response_cache_connect() as conn:
+                row = conn.execute(
+                    "SELECT response, created FROM llm_cache WHERE key = ?",
+                    (key,),
+                ).fetchone()
+
+            if row and time.time() - row[1] <= self._response_cache_ttl:
+                if len(self._response_cache) >= self._response_cache_maxsize:
+                    self._response_cache.popitem(last=False)
+                self._response_cache[key] = (row[0], row[1])
+                return row[0]
+
+        except Exception as e:
+            self.logger.warning(f"Error reading response cache: {e}")
+
+        return None
+
+    def _response_cache_store(self, key: str, response: str):
+        """Store a response in the in-memory LRU and the sqlite mirror"""
+        if len(self._response_cache) >= self._response_cache_maxsize:
+            self._response_cache.popitem(last=False)
+        self._response_cache[key] = (response, time.time())
+
+        try:
+            with self._response_cache_db_lock, self._response_cache_connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, response, created) "
+                    "VALUES (?, ?, ?)",
+                    (key, response, time.time()),
+                )
+                conn.execute(
+                    "DELETE FROM llm_cache WHERE created < ?",
+                    (time.time() - self._response_cache_ttl,),
+                )
+
+        except Exception as e:
+            self.logger.warning(f"Error persisting response cache entry: {e}")
 
     def generate_response(
         self,
@@ -91,6 +259,16 @@ class LLMInterface:
             else:
                 prompt = self._build_generic_prompt(query, context)
 
+            # Skip caching at higher temperatures, where identical prompts
+            # are expected to produce different responses
+            cache_key = None
+            if self.temperature <= 0.3:
+                cache_key = self._response_cache_key(prompt)
+                cached_response = self._response_cache_lookup(cache_key)
+                if cached_response is not None:
+                    self.logger.info("LLM response cache hit")
+                    return cached_response
+
             # Generate response with retries
             for attempt in range(max_retries):
                 try:
@@ -101,7 +279,7 @@ class LLMInterface:
                         messages=[
                             {
                                 "role": "system",
-                                "content": "You are a helpful assistant for Ottawa city services. Provide accurate, helpful information based on official sources.",
+                                "content": self._SYSTEM_PREFIX,
                             },
                             {"role": "user", "content": prompt},
                         ],
@@ -118,7 +296,11 @@ class LLMInterface:
                     self._update_statistics(completion, response_time)
 
                     self.logger.info(f"Generated response in {response_time:.2f}s")
-                    return response.strip()
+
+                    response = response.strip()
+                    if cache_key is not None:
+                        self._response_cache_store(cache_key, response)
+                    return response
 
                 except Exception as e:
                     self.logger.warning(f"Attempt {attempt + 1} failed: {e}")
@@ -130,27 +312,220 @@ class LLMInterface:
             self.logger.error(f"Error generating response: {e}")
             return self._get_fallback_response(query)
 
-    def _build_ottawa_prompt(self, query: str, context: str) -> str:
-        """Build optimized prompt for Ottawa city services"""
-        prompt = f"""Based on the following official Ottawa city information, please answer the user's question accurately and helpfully.
+    def generate_batch(
+        self, queries: List[str], contexts: List[str], max_batch: int = 6
+    ) -> List[str]:
+        """
+        Answer several questions in one completion per batch of six
+
+        The shared system prompt and instruction tokens are paid once per
+        batch instead of once per question. Falls back to per-question
+        calls when the batched answer cannot be parsed.
+
+        Args:
+            queries: User questions
+            contexts: Retrieved context per question (same length)
+            max_batch: Maximum questions per completion (context budget)
+
+        Returns:
+            List of response strings, in input order
+        """
+        if not self.client:
+            return [self._get_fallback_response(query) for query in queries]
+
+        answers: List[str] = []
+        for start in range(0, len(queries), max_batch):
+            answers.extend(
+                self._generate_one_batch(
+                    queries[start : start + max_batch],
+                    contexts[start : start + max_batch],
+                )
+            )
+        return answers
+
+    def _generate_one_batch(
+        self, queries: List[str], contexts: List[str]
+    ) -> List[str]:
+        """Run one indexed multi-question completion and parse the answers"""
+        prompt_parts = [
+            "Answer each of the following questions about Ottawa city services "
+            "using only its matching context.\n"
+        ]
+        for i, (query, context) in enumerate(zip(queries, contexts), 1):
+            prompt_parts.append(f"Q[{i}]: {query}\nContext[{i}]:\n{context}\n")
+
+        prompt_parts.append(
+            "Respond with exactly one answer per question, formatted as:\n"
+            + "\n".join(f"A[{i}]: <answer>" for i in range(1, len(queries) + 1))
+        )
+        prompt = "\n".join(prompt_parts)
+
+        try:
+            start_time = time.time()
+
+            completion = self.client.chat.completions.create(
+                model=self.model_name,
+                messages=[
+                    {
+                        "role": "system",
+                        "content": self._SYSTEM_PREFIX,
+                    },
+                    {"role": "user", "content": prompt},
+                ],
+                max_tokens=self.max_tokens * len(queries),
+                temperature=self.temperature,
+            )
+
+            self._update_statistics(completion, time.time() - start_time)
+
+            text = completion.choices[0].message.content
+            parsed = {
+                int(index): answer.strip()
+                for index, answer in _BATCH_ANSWER_RE.findall(text)
+            }
+
+            if all(i in parsed for i in range(1, len(queries) + 1)):
+                return [parsed[i] for i in range(1, len(queries) + 1)]
+
+            self.logger.warning(
+                "Batched answer parse failed; retrying questions individually"
+            )
+
+        except Exception as e:
+            self.logger.warning(f"Batched completion failed: {e}")
+
+        return [
+            self.generate_response(query, context)
+            for query, context in zip(queries, contexts)
+        ]
+
+    async def _acomplete(self, query: str, prompt: str, max_retries: int = 3) -> str:
+        """Run one completion on the shared async client with retries"""
+        for attempt in range(max_retries):
+            try:
+                start_time = time.time()
+
+                completion = await self.aclient.chat.completions.create(
+                    model=self.model_name,
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": self._SYSTEM_PREFIX,
+                        },
+                        {"role": "user", "content": prompt},
+                    ],
+                    max_tokens=self.max_tokens,
+                    temperature=self.temperature,
+                )
+
+                response_time = time.time() - start_time
+                response = completion.choices[0].message.content
+                self._update_statistics(completion, response_time)
+                return response.strip()
+
+            except Exception as e:
+                self.logger.warning(f"Async attempt {attempt + 1} failed: {e}")
+                if attempt == max_retries - 1:
+                    return self._get_fallback_response(query)
+                await asyncio.sleep(2**attempt)  # Exponential backoff
+
+    async def generate_response_batch(
+        self, queries: List[str], contexts: List[str]
+    ) -> List[str]:
+        """
+        Generate responses for several (query, context) pairs concurrently
+
+        All requests share the pooled async client, so N queries complete
+        in roughly the time of the slowest one instead of N round-trips.
+
+        Args:
+            queries: User questions
+            contexts: Retrieved context per question (same length)
+
+        Returns:
+            List of response strings, in input order
+        """
+        if not self.aclient:
+            return [self._get_fallback_response(query) for query in queries]
+
+        prompts = [
+            self._build_ottawa_prompt(query, context)
+            for query, context in zip(queries, contexts)
+        ]
+
+        return list(
+            await asyncio.gather(
+                *[
+                    self._acomplete(query, prompt)
+                    for query, prompt in zip(queries, prompts)
+                ]
+            )
+        )
+
+    def generate_response_stream(
+        self,
+        query: str,
+        context: str,
+        use_ottawa_prompt: bool = True,
+        custom_prompt: Optional[str] = None,
+    ) -> Iterator[str]:
+        """
+        Generate response using LLM with context, streaming tokens as they arrive
 
-CONTEXT FROM OTTAWA.CA:
-{context}
+        Yields:
+            Response text deltas (str) as the model generates them
+        """
 
-USER QUESTION: {query}
+        if not self.client:
+            yield self._get_fallback_response(query)
+            return
 
-INSTRUCTIONS:
-1. Provide a clear, accurate answer based on the context above
-2. If the context contains specific procedures, list them step by step
-3. Include relevant fees, locations, or contact information when available
-4. If the context doesn't fully answer the question, say so clearly
-5. Always prioritize official Ottawa information over general knowledge
-6. Be helpful and conversational while remaining factual
-7. If mentioning fees or procedures, note that information should be verified on ottawa.ca as it may change
+        try:
+            # Build the prompt
+            if custom_prompt:
+                prompt = custom_prompt.format(query=query, context=context)
+            elif use_ottawa_prompt:
+                prompt = self._build_ottawa_prompt(query, context)
+            else:
+                prompt = self._build_generic_prompt(query, context)
 
-RESPONSE:"""
+            start_time = time.time()
+
+            stream = self.client.chat.completions.create(
+                model=self.model_name,
+                messages=[
+                    {
+                        "role": "system",
+                        "content": self._SYSTEM_PREFIX,
+                    },
+                    {"role": "user", "content": prompt},
+                ],
+                max_tokens=self.max_tokens,
+                temperature=self.temperature,
+                stream=True,
+            )
+
+            for chunk in stream:
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    yield delta
+
+            response_time = time.time() - start_time
+            self._update_statistics(None, response_time)
+
+            self.logger.info(f"Streamed response in {response_time:.2f}s")
+
+        except Exception as e:
+            self.logger.error(f"Error streaming response: {e}")
+            yield self._get_fallback_response(query)
+
+    def _build_ottawa_prompt(self, query: str, context: str) -> str:
+        """Build the volatile user message for Ottawa city services
 
-        return prompt
+        The steering instructions live in _SYSTEM_PREFIX so only the
+        context and question vary between requests.
+        """
+        return f"CONTEXT FROM OTTAWA.CA:\n{context}\n\nQUESTION: {query}"
 
     def _build_generic_prompt(self, query: str, context: str) -> str:
         """Build generic prompt for general questions"""
@@ -184,10 +559,10 @@ Answer:"""
         try:
             self.total_requests += 1
 
-            # Update response time (moving average)
-            self.avg_response_time = (
-                self.avg_response_time * (self.total_requests - 1) + response_time
-            ) / self.total_requests
+            # Update response time (running sum avoids the precision
+            # drift of re-deriving the average from itself)
+            self._rt_sum += response_time
+            self.avg_response_time = self._rt_sum / self.total_requests
 
             # Update token usage if available
             if hasattr(completion, "usage") and completion.usage:
@@ -6,8 +6,10 @@ Based on your Databricks implementation with full dataset
 import os
 import json
 import numpy as np
-from typing import List, Dict, Any, Optional
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
 import logging
+from datetime import datetime, timezone
 from pathlib import Path
 
 # Core ML libraries
@@ -16,7 +18,6 @@ import chromadb
 from groq import Groq
 
 # Data processing
-import pandas as pd
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
 # Custom modules - absolute imports
@@ -24,6 +25,19 @@ from embeddings import EmbeddingManager
 from vector_store import VectorStore
 from llm_interface import LLMInterface
 
+try:
+    # Optional: orjson decodes the dataset files several times faster
+    # than stdlib json
+    import orjson
+
+    def _json_loads(data):
+        return orjson.loads(data)
+
+except ImportError:
+
+    def _json_loads(data):
+        return json.loads(data)
+
 
 class OttawaRAGPipeline:
     """
@@ -59,6 +73,26 @@ class OttawaRAGPipeline:
         self.chunks = []
         self.is_initialized = False
 
+        # Semantic response cache: recently answered questions kept as
+        # unit-norm embeddings in a fixed ring buffer, so near-duplicate
+        # questions get a dot-product lookup instead of an LLM call
+        self._sem_cache_capacity = 1024
+        self._sem_cache_threshold = 0.95
+        self._sem_cache_vecs = np.zeros(
+            (self._sem_cache_capacity, self.embedding_manager.embedding_dimension),
+            dtype=np.float32,
+        )
+        self._sem_cache_responses: List[Optional[Dict[str, Any]]] = [
+            None
+        ] * self._sem_cache_capacity
+        self._sem_cache_count = 0
+        self._sem_cache_next = 0
+
+        # Memoized single-query embeddings: repeat queries cost a dict
+        # lookup instead of a transformer forward pass (tuples because
+        # lru_cache needs hashable values)
+        self._q_emb_cache = lru_cache(maxsize=2048)(self._embed_one)
+
         # Setup logging
         self._setup_logging()
 
@@ -78,12 +112,23 @@ class OttawaRAGPipeline:
         try:
             self.logger.info("Loading complete Ottawa dataset...")
 
-            # Load processed chunks
-            with open(self.data_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            # Prefer the split meta.json + chunks.jsonl layout written by
+            # DataProcessor.save_processed_data; fall back to the legacy
+            # single-JSON format for older datasets
+            meta_path = self.data_path.with_suffix("").with_suffix(".meta.json")
+            jsonl_path = self.data_path.with_suffix(".jsonl")
+
+            if meta_path.exists() and jsonl_path.exists():
+                meta = _json_loads(meta_path.read_bytes())
+
+                self.documents = meta.get("documents", [])
+                with open(jsonl_path, "rb") as f:
+                    self.chunks = [_json_loads(line) for line in f if line.strip()]
+            else:
+                data = _json_loads(self.data_path.read_bytes())
 
-            self.documents = data.get("documents", [])
-            self.chunks = data.get("chunks", [])
+                self.documents = data.get("documents", [])
+                self.chunks = data.get("chunks", [])
 
             self.logger.info(f"Loaded {len(self.documents)} documents")
             self.logger.info(f"Loaded {len(self.chunks)} text chunks")
@@ -106,9 +151,13 @@ class OttawaRAGPipeline:
                 self.logger.error("No chunks loaded. Call load_full_dataset() first.")
                 return False
 
-            # Generate embeddings for all chunks
+            # Generate embeddings for all chunks; the content-hash disk
+            # cache in EmbeddingManager means unchanged chunks load from
+            # disk and only new/edited chunks hit the model
             chunk_texts = [chunk["content"] for chunk in self.chunks]
-            embeddings = self.embedding_manager.generate_embeddings(chunk_texts)
+            embeddings = self.embedding_manager.generate_embeddings(
+                chunk_texts, use_cache=True
+            )
 
             # Setup vector store
             self.vector_store.create_collection("ottawa_complete")
@@ -124,12 +173,16 @@ class OttawaRAGPipeline:
                 for chunk in self.chunks
             ]
 
-            self.vector_store.add_documents(
-                ids=chunk_ids,
-                documents=chunk_texts,
-                embeddings=embeddings,
-                metadatas=metadatas,
-            )
+            # Insert in bounded batches so Chroma never has to hold the
+            # whole corpus in one serialized payload
+            batch_size = 256
+            for i in range(0, len(chunk_ids), batch_size):
+                self.vector_store.add_documents(
+                    ids=chunk_ids[i : i + batch_size],
+                    documents=chunk_texts[i : i + batch_size],
+                    embeddings=embeddings[i : i + batch_size],
+                    metadatas=metadatas[i : i + batch_size],
+                )
 
             self.is_initialized = True
             self.logger.info("Vector database initialized successfully")
@@ -140,15 +193,25 @@ class OttawaRAGPipeline:
             return False
 
     def search_relevant_context(
-        self, query: str, top_k: int = 5, similarity_threshold: float = 0.1
+        self,
+        query: str,
+        top_k: int = 5,
+        similarity_threshold: float = 0.1,
+        precomputed_embedding: Optional[np.ndarray] = None,
     ) -> List[Dict[str, Any]]:
         """
         Search for relevant context using semantic similarity
 
+        Retrieval is delegated to ChromaDB's native HNSW query (executed in
+        the vector store backend); no Python-side cosine scan of the corpus
+        happens on this path.
+
         Args:
             query: User question
             top_k: Number of chunks to retrieve
             similarity_threshold: Minimum similarity score
+            precomputed_embedding: Optional externally computed query embedding
+                (e.g. from a caller-side embedding cache)
 
         Returns:
             List of relevant chunks with metadata
@@ -160,19 +223,30 @@ class OttawaRAGPipeline:
                 )
                 return []
 
-            # Generate query embedding
-            query_embedding = self.embedding_manager.generate_embeddings([query])[0]
+            # Generate query embedding unless the caller already has one;
+            # repeat queries hit the lru_cache instead of the model
+            if precomputed_embedding is not None:
+                query_embedding = np.asarray(precomputed_embedding, dtype=np.float32)
+            else:
+                query_embedding = np.asarray(
+                    self._q_emb_cache(query), dtype=np.float32
+                )
 
-            # Search vector store
+            # Search vector store with a contiguous float32 query vector
+            query_embedding = np.ascontiguousarray(query_embedding, dtype=np.float32)
             results = self.vector_store.search(
                 query_embedding=query_embedding, top_k=top_k
             )
 
-            # Filter by similarity threshold
-            relevant_chunks = []
-            for result in results:
-                if result.get("similarity", 0) >= similarity_threshold:
-                    relevant_chunks.append(result)
+            # Filter by similarity threshold (vectorized over the result set)
+            sims = np.fromiter(
+                (result.get("similarity", 0.0) for result in results),
+                dtype=np.float32,
+                count=len(results),
+            )
+            relevant_chunks = [
+                results[i] for i in np.flatnonzero(sims >= similarity_threshold)
+            ]
 
             self.logger.info(f"Found {len(relevant_chunks)} relevant chunks for query")
             return relevant_chunks
@@ -244,12 +318,62 @@ class OttawaRAGPipeline:
                 "confidence": 0.0,
             }
 
-    def answer_question(self, question: str) -> Dict[str, Any]:
+    def _embed_one(self, text: str) -> Tuple[float, ...]:
+        """Embed a single text; wrapped with lru_cache in __init__"""
+        return tuple(
+            self.embedding_manager.generate_embeddings(
+                [text], show_progress=False
+            )[0].tolist()
+        )
+
+    def _normalized_query_embedding(
+        self, question: str, precomputed_embedding: Optional[np.ndarray]
+    ) -> np.ndarray:
+        """Embed the question (or reuse a caller-provided embedding) and
+        return a unit-norm float32 copy"""
+        if precomputed_embedding is not None:
+            embedding = np.asarray(precomputed_embedding, dtype=np.float32)
+        else:
+            embedding = np.asarray(self._q_emb_cache(question), dtype=np.float32)
+
+        norm = np.linalg.norm(embedding)
+        return embedding / norm if norm else embedding
+
+    def _semantic_cache_check(self, q_emb: np.ndarray) -> Optional[Dict[str, Any]]:
+        """Return a cached response for a near-duplicate question, or None"""
+        if not self._sem_cache_count:
+            return None
+
+        sims = self._sem_cache_vecs[: self._sem_cache_count] @ q_emb
+        best_idx = int(np.argmax(sims))
+
+        if sims[best_idx] >= self._sem_cache_threshold:
+            self.logger.info(
+                f"Semantic response cache hit (similarity: {sims[best_idx]:.3f})"
+            )
+            return self._sem_cache_responses[best_idx]
+
+        return None
+
+    def _semantic_cache_add(self, q_emb: np.ndarray, response: Dict[str, Any]):
+        """Insert a response at the ring-buffer head, evicting the oldest"""
+        idx = self._sem_cache_next
+        self._sem_cache_vecs[idx] = q_emb
+        self._sem_cache_responses[idx] = response
+        self._sem_cache_next = (idx + 1) % self._sem_cache_capacity
+        self._sem_cache_count = min(
+            self._sem_cache_count + 1, self._sem_cache_capacity
+        )
+
+    def answer_question(
+        self, question: str, precomputed_embedding: Optional[np.ndarray] = None
+    ) -> Dict[str, Any]:
         """
         Complete RAG pipeline: retrieve relevant context and generate answer
 
         Args:
             question: User's question about Ottawa services
+            precomputed_embedding: Optional externally computed question embedding
 
         Returns:
             Complete response with answer, sources, and metadata
@@ -257,8 +381,21 @@ class OttawaRAGPipeline:
         try:
             self.logger.info(f"Processing question: {question}")
 
+            # Step 0: Check the semantic cache for a near-duplicate question
+            query_embedding = self._normalized_query_embedding(
+                question, precomputed_embedding
+            )
+
+            cached = self._semantic_cache_check(query_embedding)
+            if cached is not None:
+                response = dict(cached)
+                response["timestamp"] = datetime.now(timezone.utc).isoformat()
+                return response
+
             # Step 1: Retrieve relevant context
-            relevant_chunks = self.search_relevant_context(question, top_k=5)
+            relevant_chunks = self.search_relevant_context(
+                question, top_k=5, precomputed_embedding=query_embedding
+            )
 
             # Step 2: Generate response
             response = self.generate_response(question, relevant_chunks)
@@ -267,13 +404,17 @@ class OttawaRAGPipeline:
             response.update(
                 {
                     "query": question,
-                    "timestamp": pd.Timestamp.now().isoformat(),
+                    "timestamp": datetime.now(timezone.utc).isoformat(),
                     "pipeline_version": "1.0.0",
                     "total_documents": len(self.documents),
                     "total_chunks": len(self.chunks),
                 }
             )
 
+            # Cache successful answers only
+            if response.get("confidence", 0) > 0:
+                self._semantic_cache_add(query_embedding, response)
+
             return response
 
         except Exception as e:
@@ -285,6 +426,83 @@ class OttawaRAGPipeline:
                 "error": str(e),
             }
 
+    def answer_question_stream(
+        self, question: str, precomputed_embedding: Optional[np.ndarray] = None
+    ):
+        """
+        Streaming variant of answer_question for low time-to-first-token
+
+        Yields a metadata dict first (sources, confidence, pipeline info),
+        then the answer text in incremental deltas as the LLM generates it.
+
+        Args:
+            question: User's question about Ottawa services
+            precomputed_embedding: Optional externally computed question embedding
+        """
+        try:
+            self.logger.info(f"Processing question (streaming): {question}")
+
+            # Step 1: Retrieve relevant context
+            relevant_chunks = self.search_relevant_context(
+                question, top_k=5, precomputed_embedding=precomputed_embedding
+            )
+
+            metadata = {
+                "query": question,
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "pipeline_version": "1.0.0",
+                "total_documents": len(self.documents),
+                "total_chunks": len(self.chunks),
+            }
+
+            if not relevant_chunks:
+                metadata.update({"sources": [], "confidence": 0.0})
+                yield metadata
+                yield "I couldn't find relevant information about that topic in my Ottawa database."
+                return
+
+            # Format context
+            context_text = "\n\n".join(
+                [
+                    f"Source {i+1}: {chunk['document']}"
+                    for i, chunk in enumerate(relevant_chunks)
+                ]
+            )
+
+            # Extract sources
+            sources = []
+            for chunk in relevant_chunks:
+                chunk_metadata = chunk.get("metadata", {})
+                sources.append(
+                    {
+                        "url": chunk_metadata.get("url", ""),
+                        "source_file": chunk_metadata.get("source_file", ""),
+                        "similarity": chunk.get("similarity", 0.0),
+                    }
+                )
+
+            metadata.update(
+                {
+                    "sources": sources,
+                    "confidence": np.mean(
+                        [chunk.get("similarity", 0) for chunk in relevant_chunks]
+                    ),
+                    "chunks_used": len(relevant_chunks),
+                }
+            )
+            yield metadata
+
+            # Step 2: Stream the response from the LLM
+            for delta in self.llm_interface.generate_response_stream(
+                query=question, context=context_text
+            ):
+                yield delta
+
+        except Exception as e:
+            self.logger.error(f"Error in streaming RAG pipeline: {e}")
+            yield {"sources": [], "confidence": 0.0, "error": str(e)}
+            yield "I encountered an unexpected error. Please try rephrasing your question."
+
     def get_system_stats(self) -> Dict[str, Any]:
         """Get comprehensive system statistics"""
         return {
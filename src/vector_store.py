@@ -5,13 +5,53 @@ Handles ChromaDB operations with optimizations for large-scale retrieval
 
 import chromadb
 from chromadb.config import Settings
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import hashlib
 import numpy as np
+import time
 from typing import List, Dict, Any, Optional, Union
 import logging
 from pathlib import Path
 import json
+import threading
 import uuid
 
+# One PersistentClient per database path, shared across VectorStore
+# instances: opening a client re-maps the SQLite file and reloads HNSW
+# state, which is expensive and should be amortized per process
+_CLIENT_CACHE: Dict[str, Any] = {}
+_CLIENT_LOCK = threading.Lock()
+
+try:
+    # Optional: orjson encodes/decodes backup records several times
+    # faster than stdlib json
+    import orjson
+
+    def _json_dumps(data) -> str:
+        return orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY).decode("utf-8")
+
+    def _json_loads(data):
+        return orjson.loads(data)
+
+except ImportError:
+
+    def _json_dumps(data) -> str:
+        return json.dumps(data, ensure_ascii=False)
+
+    def _json_loads(data):
+        return json.loads(data)
+
+
+try:
+    # Optional: pyarrow enables a columnar parquet backup format with
+    # binary embeddings instead of text-encoded floats
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
 
 class VectorStore:
     """
@@ -25,11 +65,22 @@ class VectorStore:
     - Collection management
     """
 
+    # Built once; search runs per query, so the conditional include
+    # lists are picked instead of allocated per call (lists rather than
+    # tuples because Chroma validates include as a list)
+    _INCLUDE_WITH_DIST = ["documents", "metadatas", "distances"]
+    _INCLUDE_NO_DIST = ["documents", "metadatas"]
+
     def __init__(
         self,
         db_path: str = "data/embeddings/chroma_db",
         collection_name: str = "ottawa_complete",
         distance_metric: str = "cosine",
+        use_memory_cache: bool = False,
+        memory_cache_int8: bool = False,
+        hnsw_m: int = 32,
+        hnsw_ef_construction: int = 200,
+        hnsw_ef_search: int = 64,
     ):
         """
         Initialize the vector store
@@ -38,16 +89,66 @@ class VectorStore:
             db_path: Path to ChromaDB persistent storage
             collection_name: Name of the default collection
             distance_metric: Distance metric for similarity search ('cosine', 'l2', 'ip')
+            use_memory_cache: Serve unfiltered searches from an in-memory
+                embedding matrix (brute-force cosine); faster than the
+                HNSW/SQLite path for corpora up to ~100k chunks
+            memory_cache_int8: Hold the in-memory matrix as int8 with
+                per-row scales — a quarter of the float32 footprint at
+                near-identical retrieval quality
+            hnsw_m: HNSW graph degree; higher raises recall and memory
+            hnsw_ef_construction: Candidate list size while building the
+                index; higher builds a better graph at slower insert
+            hnsw_ef_search: Candidate list size at query time; the main
+                recall/latency knob (Chroma's default is tuned for speed
+                and caps recall well below 90% on this corpus size)
         """
         self.db_path = Path(db_path)
         self.collection_name = collection_name
         self.distance_metric = distance_metric
+        self.use_memory_cache = use_memory_cache
+        self.memory_cache_int8 = memory_cache_int8
+        self.hnsw_m = hnsw_m
+        self.hnsw_ef_construction = hnsw_ef_construction
+        self.hnsw_ef_search = hnsw_ef_search
+
+        # Lazily warmed by _warm_cache() on the first eligible search
+        self._emb_matrix = None
+        self._emb_i8 = None
+        self._emb_scales = None
+        self._cached_ids = None
+        self._cached_docs = None
+        self._cached_metas = None
+        self._warmed_collection = None
+
+        # An append-only sidecar (see _sidecar_paths) mirrors inserted
+        # embeddings per collection, so a cold process can memmap the
+        # matrix instead of paging it out of SQLite on the first
+        # brute-force search
 
         # Initialize ChromaDB client
         self._setup_logging()
+        # Cached once so hot paths skip both the isEnabledFor walk and
+        # message formatting when INFO is off
+        self._log_info = self.logger.isEnabledFor(logging.INFO)
         self._initialize_client()
         self.current_collection = None
 
+        # LRU cache of search results: query traffic is heavily skewed
+        # toward a small set of repeat queries, and a hit skips the
+        # whole Chroma query path. Invalidated on any mutation.
+        self._query_cache = OrderedDict()
+        self._query_cache_maxsize = 1024
+
+        # Canonicalized where_filter objects keyed on their items, so a
+        # small set of repeated filter templates is rewritten once
+        self._filter_cache = {}
+        self._filter_cache_maxsize = 256
+
+        # (timestamp, payload) for get_database_stats: counts change
+        # rarely, and each count() is its own SQLite transaction
+        self._stats_cache = (0.0, None)
+        self._stats_cache_ttl = 5.0
+
     def _setup_logging(self):
         """Setup logging for vector store operations"""
         self.logger = logging.getLogger(__name__)
@@ -58,11 +159,20 @@ class VectorStore:
             # Create database directory
             self.db_path.mkdir(parents=True, exist_ok=True)
 
-            # Initialize ChromaDB client
-            self.client = chromadb.PersistentClient(
-                path=str(self.db_path),
-                settings=Settings(anonymized_telemetry=False, allow_reset=True),
-            )
+            # Initialize ChromaDB client, reusing any client already
+            # opened for the same path in this process
+            key = str(self.db_path.resolve())
+            with _CLIENT_LOCK:
+                client = _CLIENT_CACHE.get(key)
+                if client is None:
+                    client = chromadb.PersistentClient(
+                        path=key,
+                        settings=Settings(
+                            anonymized_telemetry=False, allow_reset=True
+                        ),
+                    )
+                    _CLIENT_CACHE[key] = client
+            self.client = client
 
             self.logger.info(f"ChromaDB client initialized at: {self.db_path}")
 
@@ -94,16 +204,27 @@ class VectorStore:
             if overwrite:
                 try:
                     self.client.delete_collection(name=name)
+                    self._drop_matrix_sidecar(name)
                     self.logger.info(f"Deleted existing collection: {name}")
                 except:
                     pass  # Collection might not exist
 
-            # Create or get collection
+            # Create or get collection; hnsw:* keys are read by Chroma
+            # at creation time only
+            collection_metadata = {
+                "description": "Ottawa city services documents",
+                "hnsw:space": self.distance_metric,
+                "hnsw:M": self.hnsw_m,
+                "hnsw:construction_ef": self.hnsw_ef_construction,
+                "hnsw:search_ef": self.hnsw_ef_search,
+            }
+            if metadata:
+                collection_metadata.update(metadata)
+
             try:
                 self.current_collection = self.client.create_collection(
                     name=name,
-                    metadata=metadata
-                    or {"description": "Ottawa city services documents"},
+                    metadata=collection_metadata,
                     embedding_function=None,  # We'll provide embeddings directly
                 )
                 self.logger.info(f"Created new collection: {name}")
@@ -113,6 +234,10 @@ class VectorStore:
                 self.logger.info(f"Using existing collection: {name}")
 
             self.collection_name = name
+            # Cached results and the warmed matrix belong to the
+            # previous collection; without this a repeated query after a
+            # switch would replay the old collection's hits
+            self.cache_clear()
             return True
 
         except Exception as e:
@@ -125,7 +250,7 @@ class VectorStore:
         documents: List[str],
         embeddings: Union[List[List[float]], np.ndarray],
         metadatas: Optional[List[Dict[str, Any]]] = None,
-        batch_size: int = 1000,
+        batch_size: int = 250,
     ) -> bool:
         """
         Add documents to the vector store in batches
@@ -147,47 +272,116 @@ class VectorStore:
                 )
                 return False
 
-            # Convert embeddings to list if numpy array
-            if isinstance(embeddings, np.ndarray):
-                embeddings = embeddings.tolist()
+            # Keep embeddings as one contiguous float32 array: Chroma
+            # accepts ndarrays directly, and slicing below yields
+            # zero-copy views instead of N*D Python float objects
+            embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
 
-            # Ensure we have metadata for each document
+            # Ensure we have metadata for each document; one shared dict
+            # is safe because Chroma serializes entries without mutating
             if metadatas is None:
-                metadatas = [{"source": "ottawa.ca"} for _ in ids]
+                default_meta = {"source": "ottawa.ca"}
+                metadatas = [default_meta] * len(ids)
 
             # Validate input lengths
             if not (len(ids) == len(documents) == len(embeddings) == len(metadatas)):
                 raise ValueError("All input lists must have the same length")
 
-            self.logger.info(f"Adding {len(documents)} documents to collection")
-
-            # Add documents in batches
-            for i in range(0, len(documents), batch_size):
-                end_idx = min(i + batch_size, len(documents))
-
-                batch_ids = ids[i:end_idx]
-                batch_documents = documents[i:end_idx]
-                batch_embeddings = embeddings[i:end_idx]
-                batch_metadatas = metadatas[i:end_idx]
+            if self._log_info:
+                self.logger.info(
+                    "Adding %d documents to collection", len(documents)
+                )
 
-                self.current_collection.add(
-                    ids=batch_ids,
-                    documents=batch_documents,
-                    embeddings=batch_embeddings,
-                    metadatas=batch_metadatas,
+            # Add documents in batches. Two submitters overlap the
+            # hnswlib insert of one batch with the SQLite write of the
+            # next; more writers just contend on the SQLite lock.
+            # Batches that fail concurrently are retried sequentially,
+            # so contention degrades to the old serial loop instead of
+            # failing the ingest.
+            total_batches = (len(documents) - 1) // batch_size + 1
+            failed_batches = []
+            with ThreadPoolExecutor(max_workers=min(2, total_batches)) as executor:
+                futures = {}
+                for i in range(0, len(documents), batch_size):
+                    end_idx = min(i + batch_size, len(documents))
+                    future = executor.submit(
+                        self._add_batch,
+                        ids[i:end_idx],
+                        documents[i:end_idx],
+                        embeddings[i:end_idx],
+                        metadatas[i:end_idx],
+                    )
+                    futures[future] = (i, end_idx)
+
+                for future in as_completed(futures):
+                    start, end_idx = futures[future]
+                    try:
+                        future.result()
+                        if self._log_info:
+                            self.logger.info(
+                                "Added batch %d/%d",
+                                start // batch_size + 1,
+                                total_batches,
+                            )
+                    except Exception as e:
+                        self.logger.warning(
+                            "Concurrent insert of batch %d failed (%s); "
+                            "will retry sequentially",
+                            start // batch_size + 1,
+                            e,
+                        )
+                        failed_batches.append((start, end_idx))
+
+            for start, end_idx in sorted(failed_batches):
+                self._add_batch(
+                    ids[start:end_idx],
+                    documents[start:end_idx],
+                    embeddings[start:end_idx],
+                    metadatas[start:end_idx],
                 )
+                if self._log_info:
+                    self.logger.info(
+                        "Added batch %d/%d (sequential retry)",
+                        start // batch_size + 1,
+                        total_batches,
+                    )
 
+            self._append_matrix_sidecar(ids, embeddings)
+            self.cache_clear()
+            if self._log_info:
                 self.logger.info(
-                    f"Added batch {i//batch_size + 1}/{(len(documents)-1)//batch_size + 1}"
+                    "Successfully added %d documents", len(documents)
                 )
-
-            self.logger.info(f"Successfully added {len(documents)} documents")
             return True
 
         except Exception as e:
             self.logger.error(f"Error adding documents: {e}")
             return False
 
+    def _add_batch(
+        self,
+        batch_ids: List[str],
+        batch_documents: List[str],
+        batch_embeddings: np.ndarray,
+        batch_metadatas: List[Dict[str, Any]],
+    ):
+        """Insert one batch into the current collection"""
+        try:
+            self.current_collection.add(
+                ids=batch_ids,
+                documents=batch_documents,
+                embeddings=batch_embeddings,
+                metadatas=batch_metadatas,
+            )
+        except (TypeError, ValueError):
+            # Older chromadb releases only accept nested lists
+            self.current_collection.add(
+                ids=batch_ids,
+                documents=batch_documents,
+                embeddings=batch_embeddings.tolist(),
+                metadatas=batch_metadatas,
+            )
+
     def search(
         self,
         query_embedding: Union[List[float], np.ndarray],
@@ -214,56 +408,440 @@ class VectorStore:
                 )
                 return []
 
-            # Convert numpy array to list if needed
-            if isinstance(query_embedding, np.ndarray):
-                query_embedding = query_embedding.tolist()
+            # Pass the query as a contiguous float32 row instead of a
+            # Python float list
+            query_embedding = np.ascontiguousarray(
+                query_embedding, dtype=np.float32
+            ).reshape(1, -1)
+
+            where_filter = self._canonical_filter(where_filter)
+
+            cache_key = self._query_cache_key(
+                query_embedding, top_k, where_filter, include_distances
+            )
+            cached = self._query_cache.get(cache_key)
+            if cached is not None:
+                self._query_cache.move_to_end(cache_key)
+                return cached
+
+            # Brute-force in-memory path: one BLAS matrix-vector product
+            # over the normalized corpus beats the HNSW/SQLite roundtrip
+            # on small corpora. Filtered queries still go to Chroma.
+            if self.use_memory_cache and where_filter is None:
+                if not self._memory_cache_ready():
+                    self._warm_cache()
+                if self._memory_cache_ready():
+                    formatted_results = self._search_memory(
+                        query_embedding[0], top_k, include_distances
+                    )
+                    self._query_cache[cache_key] = formatted_results
+                    if len(self._query_cache) > self._query_cache_maxsize:
+                        self._query_cache.popitem(last=False)
+                    return formatted_results
 
             # Perform search
             results = self.current_collection.query(
-                query_embeddings=[query_embedding],
+                query_embeddings=query_embedding,
+                n_results=top_k,
+                where=where_filter,
+                include=(
+                    self._INCLUDE_WITH_DIST
+                    if include_distances
+                    else self._INCLUDE_NO_DIST
+                ),
+            )
+
+            formatted_results = self._format_query_results(
+                results, 0, include_distances
+            )
+
+            self._query_cache[cache_key] = formatted_results
+            if len(self._query_cache) > self._query_cache_maxsize:
+                self._query_cache.popitem(last=False)
+
+            if self._log_info:
+                self.logger.info(
+                    "Found %d results for query", len(formatted_results)
+                )
+            return formatted_results
+
+        except Exception as e:
+            self.logger.error(f"Error searching documents: {e}")
+            return []
+
+    def search_batch(
+        self,
+        query_embeddings: Union[List[List[float]], np.ndarray],
+        top_k: int = 5,
+        where_filter: Optional[Dict[str, Any]] = None,
+        include_distances: bool = True,
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Search for several query embeddings in one Chroma call
+
+        A single collection.query over a (B, D) batch amortizes filter
+        compilation and the Python/native crossing across queries, which
+        is much cheaper than B separate search() calls in a loop.
+
+        Args:
+            query_embeddings: Query embedding matrix (B, D)
+            top_k: Number of results per query
+            where_filter: Metadata filter conditions (shared by the batch)
+            include_distances: Whether to include similarity scores
+
+        Returns:
+            One result list per query, in input order
+        """
+        try:
+            if not self.current_collection:
+                self.logger.error(
+                    "No collection selected. Call create_collection() first."
+                )
+                return []
+
+            query_embeddings = np.ascontiguousarray(
+                query_embeddings, dtype=np.float32
+            )
+            if query_embeddings.ndim == 1:
+                query_embeddings = query_embeddings.reshape(1, -1)
+
+            where_filter = self._canonical_filter(where_filter)
+
+            results = self.current_collection.query(
+                query_embeddings=query_embeddings,
                 n_results=top_k,
                 where=where_filter,
                 include=(
-                    ["documents", "metadatas", "distances"]
+                    self._INCLUDE_WITH_DIST
                     if include_distances
-                    else ["documents", "metadatas"]
+                    else self._INCLUDE_NO_DIST
                 ),
             )
 
-            # Format results
-            formatted_results = []
-            documents = results["documents"][0] if results["documents"] else []
-            metadatas = results["metadatas"][0] if results["metadatas"] else []
-            distances = (
-                results["distances"][0]
-                if include_distances and results.get("distances")
-                else []
+            batch_results = [
+                self._format_query_results(results, qi, include_distances)
+                for qi in range(len(query_embeddings))
+            ]
+
+            self.logger.info(
+                f"Batch search returned results for {len(batch_results)} queries"
             )
+            return batch_results
+
+        except Exception as e:
+            self.logger.error(f"Error in batch search: {e}")
+            return []
+
+    @staticmethod
+    def _public_metadata(meta: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Copy of a stored metadata dict without internal bookkeeping keys
+
+        The _emb_hash stamp written by update_document is a storage
+        detail and must not surface in search results.
+        """
+        if not meta:
+            return {}
+        if "_emb_hash" in meta:
+            return {k: v for k, v in meta.items() if k != "_emb_hash"}
+        return meta
+
+    def _format_query_results(
+        self, results: Dict[str, Any], query_index: int, include_distances: bool
+    ) -> List[Dict[str, Any]]:
+        """Format one query's slice of a Chroma query() response
 
-            for i, doc in enumerate(documents):
-                result = {
+        Chroma returns aligned lists per query, so zip replaces per-row
+        index guards, and the distance-to-similarity conversion happens
+        in one vectorized pass.
+        """
+        documents = results["documents"][query_index] if results["documents"] else []
+        metadatas = results["metadatas"][query_index] if results["metadatas"] else []
+
+        if include_distances and results.get("distances"):
+            distances = np.asarray(
+                results["distances"][query_index], dtype=np.float32
+            )
+            similarities = (
+                1.0 - distances if self.distance_metric == "cosine" else distances
+            )
+            return [
+                {
                     "document": doc,
-                    "metadata": metadatas[i] if i < len(metadatas) else {},
+                    "metadata": self._public_metadata(meta),
+                    "similarity": float(sim),
+                    "distance": float(dist),
                 }
+                for doc, meta, sim, dist in zip(
+                    documents, metadatas, similarities, distances
+                )
+            ]
 
-                if include_distances and i < len(distances):
-                    # Convert distance to similarity (assuming cosine distance)
-                    similarity = (
-                        1 - distances[i]
-                        if self.distance_metric == "cosine"
-                        else distances[i]
-                    )
-                    result["similarity"] = similarity
-                    result["distance"] = distances[i]
+        return [
+            {"document": doc, "metadata": self._public_metadata(meta)}
+            for doc, meta in zip(documents, metadatas)
+        ]
 
-                formatted_results.append(result)
+    def _query_cache_key(
+        self,
+        query_embedding: np.ndarray,
+        top_k: int,
+        where_filter: Optional[Dict[str, Any]],
+        include_distances: bool,
+    ) -> tuple:
+        """Hashable cache key covering the embedding and query options"""
+        digest = hashlib.blake2b(
+            query_embedding.tobytes(), digest_size=16
+        ).digest()
+        filter_key = (
+            json.dumps(where_filter, sort_keys=True)
+            if where_filter is not None
+            else None
+        )
+        return (digest, top_k, filter_key, include_distances)
+
+    def _canonical_filter(
+        self, where_filter: Optional[Dict[str, Any]]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Canonicalize and cache a where_filter
 
-            self.logger.info(f"Found {len(formatted_results)} results for query")
-            return formatted_results
+        Rewrites an $or of equality clauses on one field into a single
+        $in, which Chroma translates to one indexed IN (...) lookup
+        instead of a disjunction of equality scans. The result is cached
+        so repeated filter templates skip the rewrite.
+        """
+        if not where_filter:
+            return where_filter
+
+        key = repr(sorted(where_filter.items(), key=lambda item: item[0]))
+        cached = self._filter_cache.get(key)
+        if cached is not None:
+            return cached
+
+        canonical = where_filter
+        or_clauses = where_filter.get("$or") if len(where_filter) == 1 else None
+        if isinstance(or_clauses, list) and len(or_clauses) > 1:
+            fields = set()
+            values = []
+            for clause in or_clauses:
+                if not (isinstance(clause, dict) and len(clause) == 1):
+                    fields.clear()
+                    break
+                field, condition = next(iter(clause.items()))
+                if isinstance(condition, dict):
+                    if set(condition) != {"$eq"}:
+                        fields.clear()
+                        break
+                    condition = condition["$eq"]
+                fields.add(field)
+                values.append(condition)
+
+            if len(fields) == 1:
+                canonical = {fields.pop(): {"$in": values}}
+
+        if len(self._filter_cache) < self._filter_cache_maxsize:
+            self._filter_cache[key] = canonical
+        return canonical
+
+    def cache_clear(self):
+        """Drop cached search state (call after collection mutations)"""
+        self._query_cache.clear()
+        self._emb_matrix = None
+        self._emb_i8 = None
+        self._emb_scales = None
+        self._cached_ids = None
+        self._cached_docs = None
+        self._cached_metas = None
+        self._warmed_collection = None
+
+    def _warm_cache(self):
+        """Load the full collection into a normalized float32 matrix
+
+        Prefers the memmapped matrix.f32 sidecar when it matches the
+        collection, so only documents and metadata come out of SQLite;
+        otherwise falls back to a full get() including embeddings.
+        """
+        try:
+            sidecar_ids, sidecar_matrix = self._load_matrix_sidecar()
+            if sidecar_matrix is not None:
+                data = self.current_collection.get(
+                    include=["documents", "metadatas"]
+                )
+                by_id = dict(
+                    zip(data["ids"], zip(data["documents"], data["metadatas"]))
+                )
+                if len(by_id) == len(sidecar_ids) and all(
+                    doc_id in by_id for doc_id in sidecar_ids
+                ):
+                    matrix = np.array(sidecar_matrix, dtype=np.float32)
+                    ids = sidecar_ids
+                    docs = [by_id[doc_id][0] for doc_id in ids]
+                    metas = [by_id[doc_id][1] for doc_id in ids]
+                else:
+                    # Sidecar out of sync with the collection
+                    sidecar_matrix = None
+
+            if sidecar_matrix is None:
+                data = self.current_collection.get(
+                    include=["embeddings", "documents", "metadatas"]
+                )
+                if not data["ids"]:
+                    return
+                matrix = np.ascontiguousarray(data["embeddings"], dtype=np.float32)
+                ids = data["ids"]
+                docs = data["documents"]
+                metas = data["metadatas"]
+
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            self._emb_matrix = matrix / norms
+
+            if self.memory_cache_int8:
+                # Symmetric per-row quantization; the float32 matrix is
+                # dropped so the cache costs a quarter of the memory
+                row_max = np.abs(self._emb_matrix).max(axis=1)
+                row_max[row_max == 0] = 1.0
+                self._emb_scales = (row_max / 127.0).astype(np.float32)
+                self._emb_i8 = (
+                    np.round(self._emb_matrix / self._emb_scales[:, None])
+                    .clip(-127, 127)
+                    .astype(np.int8)
+                )
+                self._emb_matrix = None
+
+            self._cached_ids = ids
+            self._cached_docs = docs
+            self._cached_metas = metas
+            self._warmed_collection = self.collection_name
+
+            self.logger.info(
+                f"Warmed in-memory search cache with {len(ids)} embeddings"
+            )
 
         except Exception as e:
-            self.logger.error(f"Error searching documents: {e}")
+            self.logger.error(f"Error warming in-memory cache: {e}")
+            self._emb_matrix = None
+            self._emb_i8 = None
+            self._emb_scales = None
+
+    def _memory_cache_ready(self) -> bool:
+        """Whether the in-memory search matrix (either precision) is warm
+
+        The matrix must also have been built from the current
+        collection; state warmed before a collection switch is stale
+        even if a caller bypassed cache_clear().
+        """
+        if self._warmed_collection != self.collection_name:
+            return False
+        return self._emb_matrix is not None or self._emb_i8 is not None
+
+    def _sidecar_paths(self, collection_name: Optional[str] = None):
+        """Embedding sidecar paths for a collection (default: current)
+
+        Keyed by collection name — Chroma restricts names to filename-
+        safe characters — so collections sharing a db_path don't
+        interleave rows in one file.
+        """
+        name = collection_name or self.collection_name
+        return (
+            self.db_path / f"matrix.{name}.f32",
+            self.db_path / f"ids.{name}.jsonl",
+        )
+
+    @property
+    def _matrix_path(self) -> Path:
+        return self._sidecar_paths()[0]
+
+    @property
+    def _matrix_ids_path(self) -> Path:
+        return self._sidecar_paths()[1]
+
+    def _append_matrix_sidecar(self, ids: List[str], embeddings: np.ndarray):
+        """Append inserted embeddings and ids to the cold-start sidecar"""
+        try:
+            with open(self._matrix_path, "ab") as f:
+                embeddings.tofile(f)
+            with open(self._matrix_ids_path, "a", encoding="utf-8") as f:
+                for doc_id in ids:
+                    f.write(_json_dumps(doc_id) + "\n")
+        except Exception as e:
+            self.logger.warning(f"Could not update embedding sidecar: {e}")
+
+    def _load_matrix_sidecar(self):
+        """Memmap the embedding sidecar, or (None, None) if unusable"""
+        try:
+            if not (
+                self._matrix_path.exists() and self._matrix_ids_path.exists()
+            ):
+                return None, None
+
+            with open(self._matrix_ids_path, "r", encoding="utf-8") as f:
+                ids = [_json_loads(line) for line in f if line.strip()]
+            if not ids:
+                return None, None
+
+            flat = np.memmap(self._matrix_path, dtype=np.float32, mode="r")
+            if flat.size == 0 or flat.size % len(ids) != 0:
+                return None, None
+
+            return ids, flat.reshape(len(ids), -1)
+
+        except Exception as e:
+            self.logger.warning(f"Could not load embedding sidecar: {e}")
+            return None, None
+
+    def _drop_matrix_sidecar(self, collection_name: Optional[str] = None):
+        """Remove sidecar files that no longer mirror their collection"""
+        for path in self._sidecar_paths(collection_name):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                self.logger.warning(f"Could not remove sidecar {path}: {e}")
+
+    def _search_memory(
+        self, query_embedding: np.ndarray, top_k: int, include_distances: bool
+    ) -> List[Dict[str, Any]]:
+        """Brute-force cosine top-k over the warmed embedding matrix"""
+        norm = np.linalg.norm(query_embedding)
+        if norm == 0:
             return []
+        query_normed = query_embedding / norm
+
+        if self._emb_i8 is not None:
+            # int8 dot products with int32 accumulation, rescaled back
+            # to cosine similarity with the per-row and query scales
+            q_max = np.abs(query_normed).max()
+            if q_max == 0:
+                return []
+            q_scale = q_max / 127.0
+            q_i8 = (
+                np.round(query_normed / q_scale).clip(-127, 127).astype(np.int8)
+            )
+            scores = (
+                self._emb_i8.astype(np.int32) @ q_i8.astype(np.int32)
+            ).astype(np.float32) * self._emb_scales * np.float32(q_scale)
+        else:
+            scores = self._emb_matrix @ query_normed
+
+        k = min(top_k, len(scores))
+        idx = np.argpartition(-scores, k - 1)[:k]
+        idx = idx[np.argsort(-scores[idx])]
+
+        formatted_results = []
+        for i in idx:
+            result = {
+                "document": self._cached_docs[i],
+                "metadata": self._public_metadata(self._cached_metas[i]),
+            }
+            if include_distances:
+                similarity = float(scores[i])
+                result["similarity"] = similarity
+                result["distance"] = 1.0 - similarity
+            formatted_results.append(result)
+
+        return formatted_results
 
     def search_by_text(
         self,
@@ -340,9 +918,11 @@ class VectorStore:
         try:
             name = collection_name or self.collection_name
             self.client.delete_collection(name=name)
+            self._drop_matrix_sidecar(name)
 
             if name == self.collection_name:
                 self.current_collection = None
+                self.cache_clear()
 
             self.logger.info(f"Deleted collection: {name}")
             return True
@@ -373,17 +953,49 @@ class VectorStore:
                 update_data["documents"] = [document]
 
             if embedding is not None:
-                if isinstance(embedding, np.ndarray):
-                    embedding = embedding.tolist()
-                update_data["embeddings"] = [embedding]
+                embedding = np.ascontiguousarray(
+                    embedding, dtype=np.float32
+                ).reshape(1, -1)
+                emb_hash = hashlib.blake2b(
+                    embedding.tobytes(), digest_size=8
+                ).hexdigest()
+
+                existing = self.current_collection.get(
+                    ids=[doc_id], include=["metadatas"]
+                )
+                existing_meta = (existing["metadatas"] or [{}])[0] or {}
+
+                if existing_meta.get("_emb_hash") == emb_hash:
+                    # Identical embedding: skip the HNSW re-insertion,
+                    # which dominates the cost of an update
+                    if self._log_info:
+                        self.logger.info(
+                            "Embedding unchanged for %s; skipping", doc_id
+                        )
+                else:
+                    update_data["embeddings"] = embedding
+                    # Stamp the hash (on a copy, never the caller's
+                    # dict) so a later idempotent update can be detected
+                    # without comparing vectors
+                    metadata = dict(metadata if metadata is not None else existing_meta)
+                    metadata["_emb_hash"] = emb_hash
 
             if metadata is not None:
                 update_data["metadatas"] = [metadata]
 
+            if len(update_data) == 1:
+                return True  # Nothing left to change
+
             # Update the document
             self.current_collection.update(**update_data)
 
-            self.logger.info(f"Updated document: {doc_id}")
+            if "embeddings" in update_data:
+                # Metadata/document-only updates leave the embedding
+                # sidecar valid
+                self._drop_matrix_sidecar()
+            self.cache_clear()
+            if self._log_info:
+                self.logger.info("Updated document: %s", doc_id)
             return True
 
         except Exception as e:
@@ -401,6 +1013,8 @@ class VectorStore:
 
             self.current_collection.delete(ids=doc_ids)
 
+            self._drop_matrix_sidecar()
+            self.cache_clear()
             self.logger.info(f"Deleted {len(doc_ids)} documents")
             return True
 
@@ -408,8 +1022,15 @@ class VectorStore:
             self.logger.error(f"Error deleting documents: {e}")
             return False
 
-    def backup_collection(self, backup_path: str) -> bool:
-        """Create a backup of the current collection"""
+    def backup_collection(self, backup_path: str, page_size: int = 10000) -> bool:
+        """
+        Create a backup of the current collection
+
+        Pages through the collection instead of materializing it in one
+        get() call, writing one JSON record per line for ids, documents,
+        and metadatas plus a binary float32 .npy sidecar for embeddings,
+        so memory stays bounded by the page size.
+        """
         try:
             if not self.current_collection:
                 self.logger.error(
@@ -417,24 +1038,62 @@ class VectorStore:
                 )
                 return False
 
-            # Get all documents from collection
-            all_data = self.current_collection.get(
-                include=["documents", "metadatas", "embeddings"]
-            )
-
-            backup_data = {
-                "collection_name": self.collection_name,
-                "distance_metric": self.distance_metric,
-                "data": all_data,
-                "count": len(all_data["ids"]),
-            }
-
-            # Save to JSON file
             backup_file = Path(backup_path)
             backup_file.parent.mkdir(parents=True, exist_ok=True)
 
+            if backup_file.suffix == ".parquet" and pq is not None:
+                return self._backup_parquet(backup_file, page_size)
+
+            embeddings_file = backup_file.with_suffix(".npy")
+
+            total = self.current_collection.count()
+            embeddings_out = None
+
             with open(backup_file, "w", encoding="utf-8") as f:
-                json.dump(backup_data, f, ensure_ascii=False, indent=2)
+                header = {
+                    "collection_name": self.collection_name,
+                    "distance_metric": self.distance_metric,
+                    "count": total,
+                    "embeddings_file": embeddings_file.name,
+                }
+                f.write(_json_dumps(header) + "\n")
+
+                offset = 0
+                while offset < total:
+                    page = self.current_collection.get(
+                        limit=page_size,
+                        offset=offset,
+                        include=["documents", "metadatas", "embeddings"],
+                    )
+                    if not page["ids"]:
+                        break
+
+                    page_embeddings = np.asarray(
+                        page["embeddings"], dtype=np.float32
+                    )
+                    if embeddings_out is None:
+                        embeddings_out = np.lib.format.open_memmap(
+                            embeddings_file,
+                            mode="w+",
+                            dtype=np.float32,
+                            shape=(total, page_embeddings.shape[1]),
+                        )
+                    embeddings_out[offset : offset + len(page["ids"])] = (
+                        page_embeddings
+                    )
+
+                    for i, doc_id in enumerate(page["ids"]):
+                        record = {
+                            "id": doc_id,
+                            "document": page["documents"][i],
+                            "metadata": page["metadatas"][i],
+                        }
+                        f.write(_json_dumps(record) + "\n")
+
+                    offset += len(page["ids"])
+
+            if embeddings_out is not None:
+                embeddings_out.flush()
 
             self.logger.info(f"Backup created: {backup_file}")
             return True
@@ -446,23 +1105,40 @@ class VectorStore:
     def restore_collection(
         self, backup_path: str, collection_name: Optional[str] = None
     ) -> bool:
-        """Restore collection from backup"""
+        """Restore collection from backup (parquet, JSONL, or legacy JSON)"""
         try:
-            # Load backup data
-            with open(backup_path, "r", encoding="utf-8") as f:
-                backup_data = json.load(f)
+            backup_file = Path(backup_path)
+
+            if backup_file.suffix == ".parquet" and pq is not None:
+                return self._restore_from_parquet(backup_file, collection_name)
+
+            with open(backup_file, "r", encoding="utf-8") as f:
+                first_line = f.readline()
+                try:
+                    header = _json_loads(first_line)
+                except json.JSONDecodeError:
+                    header = None
+
+                if isinstance(header, dict) and "embeddings_file" in header:
+                    return self._restore_from_jsonl(
+                        f, backup_file, header, collection_name
+                    )
+
+            # Legacy format: one JSON document holding the full dump
+            with open(backup_file, "r", encoding="utf-8") as f:
+                backup_data = _json_loads(f.read())
 
-            # Create collection
             name = collection_name or backup_data["collection_name"]
             self.create_collection(name, overwrite=True)
 
-            # Restore data
             data = backup_data["data"]
             if data["ids"]:
                 self.add_documents(
                     ids=data["ids"],
                     documents=data["documents"],
-                    embeddings=data["embeddings"],
+                    # Stack the parsed lists once so the embeddings move
+                    # through add_documents as one float32 buffer
+                    embeddings=np.asarray(data["embeddings"], dtype=np.float32),
                     metadatas=data["metadatas"],
                 )
 
@@ -473,9 +1149,177 @@ class VectorStore:
             self.logger.error(f"Error restoring from backup: {e}")
             return False
 
+    def _backup_parquet(self, backup_file: Path, page_size: int = 10000) -> bool:
+        """Write a paged parquet backup with binary embedding columns"""
+        total = self.current_collection.count()
+        schema_metadata = {
+            "collection_name": self.collection_name,
+            "distance_metric": self.distance_metric,
+        }
+
+        if total == 0:
+            # Match the JSONL path: an empty collection still yields a
+            # restorable backup. The embedding dimension is unknowable
+            # here, so a variable-size list stands in; restore never
+            # touches it for zero rows.
+            schema = pa.schema(
+                [
+                    ("id", pa.string()),
+                    ("document", pa.string()),
+                    ("metadata_json", pa.string()),
+                    ("embedding", pa.list_(pa.float32())),
+                ],
+                metadata=schema_metadata,
+            )
+            pq.write_table(
+                schema.empty_table(), backup_file, compression="zstd"
+            )
+            self.logger.info(f"Backup created: {backup_file}")
+            return True
+
+        writer = None
+        offset = 0
+        try:
+            while offset < total:
+                page = self.current_collection.get(
+                    limit=page_size,
+                    offset=offset,
+                    include=["documents", "metadatas", "embeddings"],
+                )
+                if not page["ids"]:
+                    break
+
+                page_embeddings = np.asarray(page["embeddings"], dtype=np.float32)
+                table = pa.table(
+                    {
+                        "id": page["ids"],
+                        "document": page["documents"],
+                        "metadata_json": [
+                            _json_dumps(meta) for meta in page["metadatas"]
+                        ],
+                        "embedding": pa.FixedSizeListArray.from_arrays(
+                            pa.array(page_embeddings.ravel(), type=pa.float32()),
+                            page_embeddings.shape[1],
+                        ),
+                    }
+                ).replace_schema_metadata(schema_metadata)
+
+                if writer is None:
+                    writer = pq.ParquetWriter(
+                        backup_file, table.schema, compression="zstd"
+                    )
+                writer.write_table(table)
+
+                offset += len(page["ids"])
+        finally:
+            if writer is not None:
+                writer.close()
+
+        if writer is None:
+            self.logger.warning("Collection is empty; no parquet backup written")
+            return False
+
+        self.logger.info(f"Backup created: {backup_file}")
+        return True
+
+    def _restore_from_parquet(
+        self,
+        backup_file: Path,
+        collection_name: Optional[str],
+        page_size: int = 10000,
+    ) -> bool:
+        """Stream a parquet backup back into a fresh collection"""
+        table = pq.read_table(backup_file)
+        schema_metadata = table.schema.metadata or {}
+
+        name = (
+            collection_name
+            or schema_metadata.get(b"collection_name", b"").decode("utf-8")
+            or self.collection_name
+        )
+        self.create_collection(name, overwrite=True)
+
+        for start in range(0, table.num_rows, page_size):
+            chunk = table.slice(start, page_size)
+            embedding_col = chunk["embedding"].combine_chunks()
+            embeddings = np.asarray(
+                embedding_col.values, dtype=np.float32
+            ).reshape(len(chunk), -1)
+
+            self.add_documents(
+                ids=chunk["id"].to_pylist(),
+                documents=chunk["document"].to_pylist(),
+                embeddings=embeddings,
+                metadatas=[
+                    _json_loads(meta)
+                    for meta in chunk["metadata_json"].to_pylist()
+                ],
+            )
+
+        self.logger.info(f"Restored collection from backup: {backup_file}")
+        return True
+
+    def _restore_from_jsonl(
+        self,
+        records_file,
+        backup_file: Path,
+        header: Dict[str, Any],
+        collection_name: Optional[str],
+        page_size: int = 10000,
+    ) -> bool:
+        """Stream a paged JSONL backup back into a fresh collection"""
+        name = collection_name or header["collection_name"]
+        self.create_collection(name, overwrite=True)
+
+        embeddings_file = backup_file.parent / header["embeddings_file"]
+        if header.get("count", 0) == 0 and not embeddings_file.exists():
+            # Empty collection: the backup has a header but no sidecar
+            self.logger.info(f"Restored empty collection from: {backup_file}")
+            return True
+
+        embeddings = np.load(embeddings_file, mmap_mode="r")
+
+        ids, documents, metadatas = [], [], []
+        restored = 0
+        for line in records_file:
+            if not line.strip():
+                continue
+            record = _json_loads(line)
+            ids.append(record["id"])
+            documents.append(record["document"])
+            metadatas.append(record["metadata"])
+
+            if len(ids) >= page_size:
+                self.add_documents(
+                    ids=ids,
+                    documents=documents,
+                    embeddings=embeddings[restored : restored + len(ids)],
+                    metadatas=metadatas,
+                )
+                restored += len(ids)
+                ids, documents, metadatas = [], [], []
+
+        if ids:
+            self.add_documents(
+                ids=ids,
+                documents=documents,
+                embeddings=embeddings[restored : restored + len(ids)],
+                metadatas=metadatas,
+            )
+
+        self.logger.info(f"Restored collection from backup: {backup_file}")
+        return True
+
     def get_database_stats(self) -> Dict[str, Any]:
-        """Get comprehensive database statistics"""
+        """Get comprehensive database statistics (cached for a few seconds)"""
         try:
+            cached_at, cached_stats = self._stats_cache
+            if (
+                cached_stats is not None
+                and time.time() - cached_at < self._stats_cache_ttl
+            ):
+                return cached_stats
+
             collections = self.list_collections()
             total_documents = 0
 
@@ -496,7 +1340,7 @@ class VectorStore:
                 except Exception:
                     continue
 
-            return {
+            stats = {
                 "database_path": str(self.db_path),
                 "total_collections": len(collections),
                 "total_documents": total_documents,
@@ -505,6 +1349,8 @@ class VectorStore:
                     self.collection_name if self.current_collection else None
                 ),
             }
+            self._stats_cache = (time.time(), stats)
+            return stats
 
         except Exception as e:
             self.logger.error(f"Error getting database stats: {e}")
@@ -530,7 +1376,8 @@ if __name__ == "__main__":
 
     test_embeddings = np.random.rand(3, 384).tolist()  # Mock embeddings
     test_ids = [f"doc_{i}" for i in range(3)]
-    test_metadata = [{"source": "ottawa.ca", "category": "services"} for _ in range(3)]
+    test_meta = {"source": "ottawa.ca", "category": "services"}
+    test_metadata = [test_meta] * 3
 
     # Add documents
     success = vector_store.add_documents(
@@ -0,0 +1,76 @@
+"""
+Round-trip tests for VectorStore backup and restore
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+np = pytest.importorskip("numpy")
+
+
+class TestBackupRestoreRoundTrip:
+    """Round-trip coverage for the paged JSONL + npy backup format"""
+
+    def _round_trip(self, tmp_path, num_docs, page_size, suffix=".jsonl"):
+        """Back up a collection of num_docs and restore it into a new one"""
+        try:
+            from vector_store import VectorStore
+        except ImportError as e:
+            pytest.skip(f"Vector store import failed: {e}")
+
+        store = VectorStore(
+            db_path=str(tmp_path / "db"), collection_name="roundtrip"
+        )
+        assert store.create_collection("roundtrip", overwrite=True)
+
+        ids = [f"doc_{i}" for i in range(num_docs)]
+        documents = [f"test document {i}" for i in range(num_docs)]
+        embeddings = np.random.rand(num_docs, 8).astype(np.float32)
+
+        if num_docs:
+            assert store.add_documents(
+                ids=ids, documents=documents, embeddings=embeddings
+            )
+
+        backup_path = tmp_path / f"backup{suffix}"
+        assert store.backup_collection(str(backup_path), page_size=page_size)
+
+        assert store.restore_collection(
+            str(backup_path), collection_name="restored"
+        )
+
+        restored = store.client.get_collection("restored")
+        assert restored.count() == num_docs
+
+        if num_docs:
+            data = restored.get(include=["documents"])
+            assert sorted(data["ids"]) == sorted(ids)
+            by_id = dict(zip(data["ids"], data["documents"]))
+            assert by_id["doc_0"] == "test document 0"
+
+    def test_round_trip_empty_collection(self, tmp_path):
+        """An empty collection survives backup and restore"""
+        self._round_trip(tmp_path, num_docs=0, page_size=10)
+
+    def test_round_trip_single_page(self, tmp_path):
+        """A collection smaller than one page round-trips intact"""
+        self._round_trip(tmp_path, num_docs=3, page_size=10)
+
+    def test_round_trip_multiple_pages(self, tmp_path):
+        """A collection spanning several pages round-trips intact"""
+        self._round_trip(tmp_path, num_docs=7, page_size=2)
+
+    def test_round_trip_parquet_empty_collection(self, tmp_path):
+        """The parquet format backs up an empty collection like JSONL does"""
+        pytest.importorskip("pyarrow")
+        self._round_trip(tmp_path, num_docs=0, page_size=10, suffix=".parquet")
+
+    def test_round_trip_parquet(self, tmp_path):
+        """A populated collection round-trips through parquet"""
+        pytest.importorskip("pyarrow")
+        self._round_trip(tmp_path, num_docs=5, page_size=2, suffix=".parquet")